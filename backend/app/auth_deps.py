@@ -1,19 +1,76 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, object_session
 from jose import JWTError
 
 from .security import decode_access_token
-from .database import get_db
+from .database import get_async_db
 from .models import User
 from .schemas.user import TokenData
+from .cache import user_cache
+from .config import settings
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/auth/token")
 
-def get_current_user(
-    token: str = Depends(oauth2_scheme), 
-    db: Session = Depends(get_db)
-) -> User:
+@dataclass(frozen=True)
+class CurrentUser:
+    """Cópia imutável do usuário autenticado (pode ser mantida em cache entre requisições)."""
+    id: int
+    email: str
+    name: Optional[str]
+    is_admin: bool
+    is_active: bool
+    created_at: Optional[datetime]
+    hotmart_transaction_id: Optional[str]
+
+    @classmethod
+    def from_user(cls, user: User) -> "CurrentUser":
+        return cls(
+            id=user.id,
+            email=user.email,
+            name=user.name,
+            is_admin=bool(user.is_admin),
+            is_active=bool(user.is_active),
+            created_at=user.created_at,
+            hotmart_transaction_id=user.hotmart_transaction_id,
+        )
+
+def invalidate_user(user_id: int) -> None:
+    """Remove o usuário do cache (ex.: mudança de is_active/is_admin)."""
+    user_cache.invalidate(user_id)
+
+# Qualquer alteração ou remoção de usuário feita por este processo invalida o cache
+# depois do commit (no flush, uma requisição concorrente ainda leria a linha antiga
+# e a colocaria de volta no cache). Nos outros workers a alteração só aparece quando
+# a entrada expira: USER_CACHE_TTL_SECONDS, ou ADMIN_USER_CACHE_TTL_SECONDS para admins.
+_PENDING_INVALIDATIONS = "invalidate_users"
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _mark_user_changed(mapper, connection, target: User) -> None:
+    session = object_session(target)
+    if session is not None and target.id is not None:
+        session.info.setdefault(_PENDING_INVALIDATIONS, set()).add(target.id)
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_users(session: Session) -> None:
+    for user_id in session.info.pop(_PENDING_INVALIDATIONS, ()):
+        invalidate_user(user_id)
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending_invalidations(session: Session) -> None:
+    session.info.pop(_PENDING_INVALIDATIONS, None)
+
+async def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db)
+) -> CurrentUser:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Não foi possível validar as credenciais",
@@ -29,15 +86,30 @@ def get_current_user(
     
     if token_data.email is None:
         raise credentials_exception
-        
-    user = db.query(User).filter(User.email == token_data.email).first()
+    
+    # O token já traz o id: evita o SELECT enquanto o usuário estiver em cache
+    if token_data.id is not None:
+        cached = user_cache.get(token_data.id)
+        if cached is not None and cached.email == token_data.email:
+            return cached
+    
+    generation = user_cache.generation
+    user = (await db.execute(
+        select(User).filter(User.email == token_data.email)
+    )).scalars().first()
     
     if user is None:
         raise credentials_exception
-        
-    return user
+    
+    current_user = CurrentUser.from_user(user)
+    # Admins expiram rápido: revogar o acesso vale em todos os workers em poucos segundos
+    ttl_seconds = settings.admin_user_cache_ttl_seconds if current_user.is_admin else None
+    # Não grava se houve invalidação durante o SELECT (a linha lida pode ser a antiga)
+    user_cache.set(current_user.id, current_user, ttl_seconds=ttl_seconds, generation=generation)
+    
+    return current_user
 
-def get_current_admin_user(current_user: User = Depends(get_current_user)) -> User:
+def get_current_admin_user(current_user: CurrentUser = Depends(get_current_user)) -> CurrentUser:
     if not current_user.is_admin:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -0,0 +1,162 @@
+"""
+Caches em memória do processo.
+
+Cada worker do uvicorn tem sua própria cópia: as escritas invalidam o cache
+local na hora e o TTL limita quanto tempo os outros workers ficam desatualizados.
+"""
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Hashable, Optional
+
+from .config import settings
+
+
+@dataclass(frozen=True)
+class CachedPayload:
+    """Corpo já serializado e o ETag para respostas condicionais."""
+    body: bytes
+    etag: str
+
+
+class PayloadCache:
+    """
+    Guarda um único payload já serializado, com TTL,
+    invalidação explícita e contadores de hit/miss.
+    """
+
+    def __init__(self, name: str, ttl_seconds: int):
+        self.name = name
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._payload: Optional[CachedPayload] = None
+        self._expires_at = 0.0
+        self._version = 0
+        self._lock = asyncio.Lock()
+
+    def _fresh(self) -> bool:
+        return self._payload is not None and time.monotonic() < self._expires_at
+
+    async def get_or_load(self, loader: Callable[[], Awaitable[CachedPayload]]) -> CachedPayload:
+        """Retorna o payload em cache ou chama `loader` (uma vez, mesmo com requisições concorrentes)."""
+        if self._fresh():
+            self.hits += 1
+            return self._payload
+
+        async with self._lock:
+            if self._fresh():
+                self.hits += 1
+                return self._payload
+
+            self.misses += 1
+            version = self._version
+            payload = await loader()
+
+            # Não grava se houve invalidação durante a carga (dados possivelmente antigos)
+            if version == self._version:
+                self._payload = payload
+                self._expires_at = time.monotonic() + self.ttl_seconds
+            return payload
+
+    def invalidate(self) -> None:
+        self._payload = None
+        self._version += 1
+        self.invalidations += 1
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "name": self.name,
+            "cached": self._fresh(),
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+        }
+
+
+class TTLCache:
+    """
+    Cache LRU com expiração por item e contadores de hit/miss.
+    Thread-safe: também é usado a partir do threadpool do FastAPI.
+    """
+
+    def __init__(self, name: str, ttl_seconds: int, max_entries: int):
+        self.name = name
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        # Incrementado a cada invalidação (ver set(..., generation=...))
+        self.generation = 0
+        self._items: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            item = self._items.get(key)
+            if item is None or item[1] <= time.monotonic():
+                if item is not None:
+                    del self._items[key]
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return item[0]
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None,
+            generation: Optional[int] = None) -> None:
+        """
+        Grava `value` por `ttl_seconds` (padrão: o TTL do cache). Com `generation`
+        (lido antes de carregar o valor), não grava se houve invalidação no meio.
+        """
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+            self._items[key] = (value, time.monotonic() + ttl)
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_entries:
+                self._items.popitem(last=False)
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self.generation += 1
+            if self._items.pop(key, None) is not None:
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+            self.generation += 1
+            self.invalidations += 1
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "name": self.name,
+            "size": len(self._items),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+        }
+
+
+# Lista pública de categorias (GET /api/categories)
+category_cache = PayloadCache("categories", ttl_seconds=settings.category_cache_ttl_seconds)
+
+# Usuário autenticado por id (get_current_user)
+user_cache = TTLCache(
+    "users",
+    ttl_seconds=settings.user_cache_ttl_seconds,
+    max_entries=settings.user_cache_max_entries,
+)
@@ -1,10 +1,19 @@
 import os
 import re
 import uuid
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import BinaryIO, Dict, Iterable, Union
 import cloudinary
 from cloudinary.uploader import upload
 from cloudinary import CloudinaryImage
 
+from .config import settings
+from .image_processing import preprocess_image
+from .metrics import CLOUDINARY_LATENCY
+
 # Configuração a partir das variáveis de ambiente
 cloudinary.config(
     cloud_name=os.getenv("CLOUDINARY_CLOUD_NAME"),
@@ -13,6 +22,51 @@ cloudinary.config(
     secure=True,
 )
 
+# Uploads para o Cloudinary são I/O bloqueante: rodam neste pool limitado,
+# fora do event loop, para não travar as demais requisições.
+_upload_executor = ThreadPoolExecutor(
+    max_workers=settings.cloudinary_upload_workers,
+    thread_name_prefix="cloudinary-upload",
+)
+
+# Transformações de cada variante servida (q_auto/f_auto)
+IMAGE_VARIANTS = {
+    "thumbnail": {
+        "width": 160,
+        "height": 160,
+        "crop": "fill",
+        "gravity": "auto",
+        "quality": "auto",
+        "fetch_format": "auto",
+    },
+    "medium": {
+        "width": 800,
+        "crop": "limit",
+        "quality": "auto",
+        "fetch_format": "auto",
+    },
+    "large": {
+        "width": 1280,
+        "crop": "limit",
+        "quality": "auto",
+        "fetch_format": "auto",
+    },
+}
+
+@lru_cache(maxsize=settings.image_url_cache_size)
+def _build_variant_url(public_id: str, variant: str) -> str:
+    """
+    Monta (uma vez por public_id/variante) a URL transformada; depois vem do cache.
+    """
+    if not public_id:
+        return ""
+    try:
+        return CloudinaryImage(public_id).build_url(
+            transformation=[dict(IMAGE_VARIANTS[variant])]
+        )
+    except Exception:
+        return ""
+
 def _slugify(value: str) -> str:
     """
     Slug simples pra compor o public_id.
@@ -31,9 +85,9 @@ class CloudinaryService:
     """
 
     @staticmethod
-    def upload_image(content: bytes, filename: str = "upload", content_type: str | None = None) -> dict:
+    def upload_image(content: Union[bytes, BinaryIO], filename: str = "upload", content_type: str | None = None) -> dict:
         """
-        Envia a imagem (bytes) para o Cloudinary.
+        Envia a imagem (bytes ou arquivo aberto) para o Cloudinary.
         Retorno: {"success": True, "public_id": "..."} ou {"success": False, "error": "..."}
         """
         try:
@@ -45,19 +99,48 @@ class CloudinaryService:
             public_id = f"recipes/{base}-{unique}"
 
             # Upload por bytes (resource_type='image' detecta automaticamente)
-            result = upload(
-                content,
-                public_id=public_id,
-                overwrite=True,
-                resource_type="image",
-                # Você pode forçar formatação/qualidade no upload, porém recomendo via URL transform:
-                # format="jpg"
-            )
+            started = time.perf_counter()
+            outcome = "error"
+            try:
+                result = upload(
+                    content,
+                    public_id=public_id,
+                    overwrite=True,
+                    resource_type="image",
+                    # Você pode forçar formatação/qualidade no upload, porém recomendo via URL transform:
+                    # format="jpg"
+                )
+                outcome = "success"
+            finally:
+                CLOUDINARY_LATENCY.labels("upload", outcome).observe(time.perf_counter() - started)
 
             return {"success": True, "public_id": result.get("public_id")}
         except Exception as e:
             return {"success": False, "error": str(e)}
 
+    @staticmethod
+    def _prepare_and_upload(content: BinaryIO, filename: str, content_type: str | None) -> dict:
+        """
+        Pré-processa (reduz/recodifica, sem EXIF) e envia. Roda no pool de uploads.
+        """
+        prepared, prepared_type = preprocess_image(content, content_type)
+        try:
+            return CloudinaryService.upload_image(prepared, filename, prepared_type)
+        finally:
+            if prepared is not content:
+                prepared.close()
+
+    @staticmethod
+    async def upload_image_async(content: BinaryIO, filename: str = "upload", content_type: str | None = None) -> dict:
+        """
+        Mesmo que upload_image, com pré-processamento, executado no pool de uploads
+        (não bloqueia o event loop).
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            _upload_executor, CloudinaryService._prepare_and_upload, content, filename, content_type
+        )
+
     # ---------- URLs transformadas (economia de banda) ----------
 
     @staticmethod
@@ -65,62 +148,57 @@ class CloudinaryService:
         """
         Miniatura 160x160, recorte 'fill', gravidade automática, q_auto/f_auto.
         """
-        if not public_id:
-            return ""
-        try:
-            return CloudinaryImage(public_id).build_url(
-                transformation=[
-                    {
-                        "width": 160,
-                        "height": 160,
-                        "crop": "fill",
-                        "gravity": "auto",
-                        "quality": "auto",
-                        "fetch_format": "auto",
-                    }
-                ]
-            )
-        except Exception:
-            return ""
+        return _build_variant_url(public_id, "thumbnail")
 
     @staticmethod
     def get_medium_url(public_id: str) -> str:
         """
         Imagem média 800px largura, mantém proporção (crop 'limit'), q_auto/f_auto.
         """
-        if not public_id:
-            return ""
-        try:
-            return CloudinaryImage(public_id).build_url(
-                transformation=[
-                    {
-                        "width": 800,
-                        "crop": "limit",
-                        "quality": "auto",
-                        "fetch_format": "auto",
-                    }
-                ]
-            )
-        except Exception:
-            return ""
+        return _build_variant_url(public_id, "medium")
 
     @staticmethod
     def get_large_url(public_id: str) -> str:
         """
         Imagem grande 1280px largura, mantém proporção (crop 'limit'), q_auto/f_auto.
         """
-        if not public_id:
-            return ""
-        try:
-            return CloudinaryImage(public_id).build_url(
-                transformation=[
-                    {
-                        "width": 1280,
-                        "crop": "limit",
-                        "quality": "auto",
-                        "fetch_format": "auto",
-                    }
-                ]
-            )
-        except Exception:
-            return ""
+        return _build_variant_url(public_id, "large")
+
+    @staticmethod
+    def get_variant_url(public_id: str, variant: str) -> str:
+        """
+        URL de uma variante ("thumbnail", "medium" ou "large"), via cache.
+        """
+        return _build_variant_url(public_id, variant)
+
+    @staticmethod
+    def url_cache_stats() -> dict:
+        info = _build_variant_url.cache_info()
+        return {
+            "hits": info.hits,
+            "misses": info.misses,
+            "size": info.currsize,
+            "max_size": info.maxsize,
+        }
+
+    @staticmethod
+    def get_image_urls(public_id: str) -> dict:
+        """
+        As três variantes de uma vez: {"thumbnail_url", "medium_url", "large_url"}.
+        """
+        return {
+            f"{variant}_url": _build_variant_url(public_id, variant)
+            for variant in IMAGE_VARIANTS
+        }
+
+    @staticmethod
+    def get_image_urls_many(public_ids: Iterable[str]) -> Dict[str, dict]:
+        """
+        Variantes de vários public_ids (ex.: uma página de receitas), sem repetir
+        o trabalho para ids duplicados. Retorno: {public_id: get_image_urls(public_id)}.
+        """
+        return {
+            public_id: CloudinaryService.get_image_urls(public_id)
+            for public_id in set(public_ids)
+            if public_id
+        }
@@ -1,20 +1,179 @@
 import os
+import threading
+import time
 from sqlalchemy import create_engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncEngine, AsyncSession
+from .config import settings
+from .metrics import instrument_engine
 
 # URL do banco de dados
 DATABASE_URL = os.getenv("DATABASE_URL", "postgresql://shapeme_user:shapeme_password@db:5432/shapeme_db")
 
+def to_async_url(url: str) -> str:
+    """Converte a URL síncrona (psycopg2) para o driver assíncrono (asyncpg)."""
+    for prefix in ("postgresql+psycopg2://", "postgresql://", "postgres://"):
+        if url.startswith(prefix):
+            return "postgresql+asyncpg://" + url[len(prefix):]
+    return url
+
+# URL assíncrona (pode ser sobrescrita pelo .env)
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL", to_async_url(DATABASE_URL))
+
+class PoolWaitStats:
+    """Tempo de espera por uma conexão livre no pool (thread-safe)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record(self, seconds: float, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.total_wait += seconds
+            self.max_wait = max(self.max_wait, seconds)
+
+    def stats(self) -> dict:
+        with self._lock:
+            attempts = self.checkouts + self.timeouts
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_avg_ms": round(self.total_wait / attempts * 1000, 3) if attempts else 0.0,
+                "wait_max_ms": round(self.max_wait * 1000, 3),
+            }
+
+class _TimedPoolMixin:
+    """Mede quanto cada checkout esperou por uma conexão (inclui abrir uma nova)."""
+    wait_stats: PoolWaitStats
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self.wait_stats.record(time.perf_counter() - start, timed_out=True)
+            raise
+        self.wait_stats.record(time.perf_counter() - start)
+        return connection
+
+class TimedQueuePool(_TimedPoolMixin, QueuePool):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait_stats = PoolWaitStats()
+
+    def recreate(self):
+        # dispose()/recreate() trocam o pool: mantém os contadores
+        pool = super().recreate()
+        pool.wait_stats = self.wait_stats
+        return pool
+
+class TimedAsyncQueuePool(_TimedPoolMixin, AsyncAdaptedQueuePool):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait_stats = PoolWaitStats()
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.wait_stats = self.wait_stats
+        return pool
+
+def _pool_options() -> dict:
+    return {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+
+def _sync_connect_args() -> dict:
+    if settings.db_statement_timeout_ms <= 0:
+        return {}
+    return {"options": f"-c statement_timeout={settings.db_statement_timeout_ms}"}
+
+def _async_connect_args() -> dict:
+    if settings.db_statement_timeout_ms <= 0:
+        return {}
+    return {"server_settings": {"statement_timeout": str(settings.db_statement_timeout_ms)}}
+
 # Engine do SQLAlchemy
-engine = create_engine(DATABASE_URL)
+engine = create_engine(
+    DATABASE_URL,
+    poolclass=TimedQueuePool,
+    connect_args=_sync_connect_args(),
+    **_pool_options(),
+)
+
+def create_pooled_async_engine(url: str) -> AsyncEngine:
+    """Engine assíncrona com o pool configurado e métricas (primário e réplicas)."""
+    pooled = create_async_engine(
+        to_async_url(url),
+        poolclass=TimedAsyncQueuePool,
+        connect_args=_async_connect_args(),
+        **_pool_options(),
+    )
+    # Contagem e duração das queries (GET /metrics)
+    instrument_engine(pooled.sync_engine)
+    return pooled
+
+# Engine assíncrona (usada pelos handlers async def)
+async_engine = create_pooled_async_engine(ASYNC_DATABASE_URL)
+
+# Contagem e duração das queries (GET /metrics)
+instrument_engine(engine)
+
+def describe_pool(pool) -> dict:
+    """Ocupação e tempos de espera de um pool de conexões."""
+    stats = {
+        "size": pool.size(),
+        "max_overflow": settings.db_max_overflow,
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        # negativo enquanto o pool ainda não abriu todas as conexões fixas
+        "overflow": pool.overflow(),
+    }
+    wait_stats = getattr(pool, "wait_stats", None)
+    if wait_stats is not None:
+        stats.update(wait_stats.stats())
+    return stats
+
+def pool_stats() -> dict:
+    """Estado atual dos pools de conexão deste processo."""
+    return {
+        "sync": describe_pool(engine.pool),
+        "async": describe_pool(async_engine.sync_engine.pool),
+    }
 
 # Session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Session factory assíncrona
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
 # Dependency para obter sessão do banco
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+# Dependency assíncrona: não bloqueia o event loop durante as queries.
+# Código síncrono dos services pode rodar sobre ela via `await db.run_sync(...)`.
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,124 @@
+"""
+Probes de liveness e readiness.
+
+- /livez: o processo responde (não toca no banco).
+- /readyz: resultado da última verificação do prober em segundo plano
+  (SELECT 1 a cada READINESS_INTERVAL_SECONDS) mais a ocupação atual do pool
+  de conexões. Com o pool quase esgotado o worker se declara indisponível,
+  para o balanceador drenar o tráfego em vez de acumular requisições nele.
+  O mesmo prober verifica as réplicas de leitura (ver replicas.py).
+
+O Cloudinary é verificado em intervalo maior (a Admin API tem limite de
+chamadas por hora) e só é informativo: sem ele os uploads falham, mas as
+leituras continuam funcionando.
+"""
+import asyncio
+import time
+from typing import Optional
+
+import cloudinary
+import cloudinary.api
+from sqlalchemy import text
+
+from .config import settings
+from .database import async_engine, pool_stats
+from .replicas import replica_set
+
+
+class ReadinessProber:
+    """Verifica as dependências em segundo plano e guarda o último resultado."""
+
+    def __init__(self, interval: float, cloudinary_interval: float, timeout: float):
+        self.interval = interval
+        self.cloudinary_interval = cloudinary_interval
+        self.timeout = timeout
+        self.database = {"ok": False, "error": "ainda não verificado", "checked_at": None, "latency_ms": None}
+        self.cloudinary = {"ok": None, "error": None, "checked_at": None}
+        self._task: Optional[asyncio.Task] = None
+
+    async def check_database(self) -> None:
+        started = time.perf_counter()
+        try:
+            async def ping():
+                async with async_engine.connect() as connection:
+                    await connection.execute(text("SELECT 1"))
+            await asyncio.wait_for(ping(), timeout=self.timeout)
+            self.database = {
+                "ok": True,
+                "error": None,
+                "checked_at": time.time(),
+                "latency_ms": round((time.perf_counter() - started) * 1000, 1),
+            }
+        except Exception as e:
+            self.database = {
+                "ok": False,
+                "error": str(e) or type(e).__name__,
+                "checked_at": time.time(),
+                "latency_ms": None,
+            }
+
+    async def check_cloudinary(self) -> None:
+        if not cloudinary.config().cloud_name:
+            self.cloudinary = {"ok": False, "error": "não configurado", "checked_at": time.time()}
+            return
+        try:
+            await asyncio.wait_for(asyncio.to_thread(cloudinary.api.ping), timeout=self.timeout)
+            self.cloudinary = {"ok": True, "error": None, "checked_at": time.time()}
+        except Exception as e:
+            self.cloudinary = {"ok": False, "error": str(e) or type(e).__name__, "checked_at": time.time()}
+
+    async def run(self) -> None:
+        next_cloudinary = 0.0
+        while True:
+            await self.check_database()
+            if replica_set:
+                await replica_set.check(self.timeout)
+            if self.cloudinary_interval > 0 and time.monotonic() >= next_cloudinary:
+                await self.check_cloudinary()
+                next_cloudinary = time.monotonic() + self.cloudinary_interval
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self.run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def readiness(self) -> dict:
+        """Estado para o /readyz (não faz I/O)."""
+        pool = pool_stats()["async"]
+        capacity = pool["size"] + pool["max_overflow"]
+        saturation = pool["checked_out"] / capacity if capacity else 0.0
+
+        reasons = []
+        checked_at = self.database["checked_at"]
+        if not self.database["ok"]:
+            reasons.append(f"banco indisponível: {self.database['error']}")
+        elif checked_at is None or time.time() - checked_at > self.interval * 3 + self.timeout:
+            reasons.append("verificação do banco desatualizada")
+        if saturation >= settings.readiness_pool_saturation:
+            reasons.append(f"pool de conexões saturado ({pool['checked_out']}/{capacity})")
+
+        return {
+            "ready": not reasons,
+            "reasons": reasons,
+            "database": self.database,
+            "cloudinary": self.cloudinary,
+            "pool": {**pool, "saturation": round(saturation, 3)},
+            # Informativo: sem réplica saudável as leituras vão para o primário
+            "read_replicas": replica_set.stats() if replica_set else None,
+        }
+
+
+readiness_prober = ReadinessProber(
+    interval=settings.readiness_interval_seconds,
+    cloudinary_interval=settings.readiness_cloudinary_interval_seconds,
+    timeout=settings.readiness_timeout_seconds,
+)
@@ -0,0 +1,72 @@
+"""
+Respostas condicionais (ETag / Last-Modified).
+
+O ETag é calculado a partir do que determina o corpo (ids, updated_at,
+parâmetros da consulta), antes da serialização: quando o cliente já tem a
+versão atual, a resposta 304 sai sem montar o JSON.
+
+Last-Modified só vale para um recurso único (GET /api/recipes/{id}): nas
+listas, o maior updated_at das linhas não muda quando uma receita é
+excluída ou sai da página/filtro, então elas dependem apenas do ETag.
+"""
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+
+from fastapi import Request, Response
+
+# Sempre revalidar com o servidor (o 304 é barato)
+CACHE_CONTROL = "no-cache"
+
+
+def make_etag(*parts) -> str:
+    """ETag forte a partir das partes que determinam o conteúdo da resposta."""
+    digest = hashlib.sha1(repr(parts).encode("utf-8")).hexdigest()
+    return f'"{digest}"'
+
+
+def etag_for_bytes(payload: bytes) -> str:
+    return f'"{hashlib.sha1(payload).hexdigest()}"'
+
+
+def http_date(value: datetime) -> str:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def cache_headers(etag: str, last_modified: Optional[datetime] = None) -> dict:
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(last_modified)
+    return headers
+
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime] = None) -> bool:
+    """
+    Avalia If-None-Match (comparação fraca, o nginx pode converter o ETag em W/ ao
+    comprimir) e, só na ausência dele, If-Modified-Since (RFC 9110).
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        tags = [tag.strip() for tag in if_none_match.split(",")]
+        return etag in [tag[2:] if tag.startswith("W/") else tag for tag in tags]
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if last_modified.tzinfo is None:
+            last_modified = last_modified.replace(tzinfo=timezone.utc)
+        return last_modified.replace(microsecond=0) <= since
+
+    return False
+
+
+def not_modified(etag: str, last_modified: Optional[datetime] = None) -> Response:
+    return Response(status_code=304, headers=cache_headers(etag, last_modified))
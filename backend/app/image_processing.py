@@ -0,0 +1,60 @@
+"""
+Pré-processamento de imagens antes do upload para o Cloudinary.
+
+Nunca servimos nada maior que a variante de 1280px (get_large_url), então
+fotos de celular são reduzidas e recodificadas (WebP/JPEG) antes de subir,
+sem os metadados EXIF. Pillow é opcional: sem ele a imagem sobe como veio.
+"""
+import tempfile
+from typing import BinaryIO, Tuple
+
+from .config import settings
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # pragma: no cover - Pillow não instalado
+    Image = None
+    ImageOps = None
+
+# Formatos que o Pillow (sem plugins) abre e que não são animados
+_PROCESSABLE_TYPES = {"image/jpeg", "image/png", "image/webp"}
+
+_OUTPUT_FORMATS = {
+    "webp": ("WEBP", "image/webp"),
+    "jpeg": ("JPEG", "image/jpeg"),
+    "jpg": ("JPEG", "image/jpeg"),
+}
+
+SPOOL_MEMORY_BYTES = 1024 * 1024
+
+
+def preprocess_image(source: BinaryIO, content_type: str) -> Tuple[BinaryIO, str]:
+    """
+    Retorna (arquivo, content_type) prontos para o upload.
+    Em qualquer falha (ou se desativado) devolve o arquivo original, rebobinado.
+    Roda no pool de uploads: é CPU-bound e não deve rodar no event loop.
+    """
+    if not settings.image_preprocess or Image is None or content_type not in _PROCESSABLE_TYPES:
+        return source, content_type
+
+    pil_format, output_type = _OUTPUT_FORMATS.get(settings.image_output_format, _OUTPUT_FORMATS["webp"])
+
+    try:
+        with Image.open(source) as image:
+            # Aplica a rotação do EXIF antes de descartá-lo
+            image = ImageOps.exif_transpose(image)
+            image.thumbnail((settings.image_max_edge, settings.image_max_edge), Image.LANCZOS)
+
+            if pil_format == "JPEG" and image.mode not in ("RGB", "L"):
+                image = image.convert("RGB")
+            elif image.mode not in ("RGB", "RGBA", "L"):
+                image = image.convert("RGBA")
+
+            output = tempfile.SpooledTemporaryFile(max_size=SPOOL_MEMORY_BYTES)
+            # Sem o parâmetro exif= o Pillow não grava os metadados originais
+            image.save(output, format=pil_format, quality=settings.image_quality, optimize=True)
+            output.seek(0)
+            return output, output_type
+    except Exception:
+        source.seek(0)
+        return source, content_type
@@ -1,12 +1,22 @@
-from fastapi import FastAPI, Depends, HTTPException, status
-from fastapi.security import OAuth2PasswordBearer
+from fastapi import FastAPI, Depends, HTTPException, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy.orm import Session
-from .database import get_db
-from .models import User
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from .database import get_async_db, pool_stats
 from typing import Optional
 import os
-from .routers.uploads import router as uploads_router
+from .cache import CachedPayload, category_cache, user_cache
+from .config import settings
+from .security import password_hash_pool
+from .cloudinary_config import CloudinaryService
+from .http_cache import cache_headers, etag_for_bytes, is_not_modified, make_etag, not_modified
+from .routers.uploads import router as uploads_router, UploadSizeLimitMiddleware
+from .metrics import MetricsMiddleware, render_metrics
+from .profiler import timed
+from .responses import FastJSONResponse, dump_json
+from .health import readiness_prober
+from .replicas import ReadYourWritesMiddleware, get_read_db, replica_set
 
 
 
@@ -14,7 +24,9 @@ from .routers.uploads import router as uploads_router
 app = FastAPI(
     title="🍃 ShapeMe API - Sistema de Cadastro",
     description="API completa para cadastro de receitas e categorias",
-    version="2.0.0"
+    version="2.0.0",
+    # orjson quando disponível (ver responses.py)
+    default_response_class=FastJSONResponse
 )
 
 # CORS
@@ -24,23 +36,67 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "Last-Modified"],
 )
 
-@app.on_event("startup")
-async def startup_event():
-    """Inicialização da aplicação"""
+# Recusa uploads grandes demais antes de ler o corpo
+app.add_middleware(UploadSizeLimitMiddleware)
+# Cookie de read-your-writes (só com réplicas de leitura configuradas)
+if replica_set:
+    app.add_middleware(ReadYourWritesMiddleware)
+# Profiler de SQL (opcional, desenvolvimento)
+if settings.sql_profiler:
+    from .database import engine, async_engine
+    from .profiler import SqlProfilerMiddleware, instrument_engine
+    
+    instrument_engine(engine)
+    for pooled in [async_engine, *replica_set.engines]:
+        instrument_engine(pooled.sync_engine)
+    app.add_middleware(SqlProfilerMiddleware)
+# Mais externo: mede também o tempo dos demais middlewares
+app.add_middleware(MetricsMiddleware)
+
+async def _warmup():
+    """
+    Prepara o worker antes do primeiro request: abre conexões no pool e carrega
+    o cache de categorias. Falhas aqui não impedem a subida (o /readyz reporta).
+    """
+    import asyncio
+    from sqlalchemy import text
+    from .database import AsyncSessionLocal, async_engine
+    
+    async def open_connection():
+        async with async_engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+    
     try:
-        from .database import engine, get_db
-        from .base import Base
-        from .models import Category, Recipe
-        
-        # Criar tabelas
-        Base.metadata.create_all(bind=engine)
-        print("✅ Tabelas criadas/verificadas com sucesso!")
-        print("🚀 ShapeMe API - Sistema de Cadastro iniciado!")
-        
+        # Simultâneas: cada uma ocupa uma conexão diferente, que volta ao pool
+        await asyncio.gather(*[open_connection() for _ in range(settings.db_pool_warmup)])
+        async with AsyncSessionLocal() as db:
+            await category_cache.get_or_load(lambda: _load_categories(db))
     except Exception as e:
-        print(f"❌ Erro na inicialização: {e}")
+        print(f"⚠️ Warmup incompleto: {e}")
+
+@app.on_event("startup")
+async def startup_event():
+    """Inicialização da aplicação (só confere a versão do schema; DDL fica com o Alembic)"""
+    from .database import async_engine
+    from .schema import check_schema_version
+    
+    async with async_engine.connect() as connection:
+        revision = await connection.run_sync(check_schema_version)
+    print(f"✅ Schema do banco na revisão {revision}")
+    
+    await _warmup()
+    print("🚀 ShapeMe API - Sistema de Cadastro iniciado!")
+    
+    # Verificação periódica do banco/Cloudinary servida pelo /readyz
+    readiness_prober.start()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Encerramento da aplicação"""
+    await readiness_prober.stop()
 
 @app.get("/")
 async def root():
@@ -54,63 +110,105 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    """Health Check"""
-    try:
-        from .database import engine, get_db
-        from sqlalchemy import text
-        
-        with engine.connect() as connection:
-            result = connection.execute(text("SELECT 1"))
-            db_status = "connected"
-    except Exception as e:
-        db_status = f"error: {str(e)}"
+    """Health Check (usa o resultado do prober em segundo plano, sem abrir conexão)"""
+    database = readiness_prober.database
+    db_status = "connected" if database["ok"] else f"error: {database['error']}"
     
     return {
         "status": "healthy",
         "service": "shapeme-api",
         "version": "2.0.0",
-        "database": db_status
+        "database": db_status,
+        "pool": pool_stats()["async"]
     }
 
+@app.get("/livez")
+async def liveness():
+    """Liveness: o processo está respondendo (não consulta o banco)"""
+    return {"status": "alive"}
+
+@app.get("/readyz")
+async def readiness():
+    """Readiness: último resultado do prober + saturação do pool (503 quando indisponível)"""
+    state = readiness_prober.readiness()
+    return FastJSONResponse(
+        {"status": "ready" if state["ready"] else "unavailable", **state},
+        status_code=200 if state["ready"] else 503,
+        headers={"Cache-Control": "no-store"}
+    )
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Métricas do processo no formato de texto do Prometheus"""
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
 from .routers.auth_router import router as auth_router
 from .routers.user_router import router as user_router
-from .auth_deps import get_current_user, get_current_admin_user
+from .auth_deps import CurrentUser, get_current_admin_user
+
+from .routers.admin import router as admin_router
 
 # Incluir roteadores
 app.include_router(auth_router)
 app.include_router(user_router)
+app.include_router(admin_router)  # todas as rotas exigem admin
 
 # ==================== CATEGORIAS ====================
 
+def _dump_json(data) -> bytes:
+    """Serializa como o JSONResponse do FastAPI (para payloads pré-serializados)"""
+    with timed("serialize"):
+        return dump_json(data)
+
+async def _load_categories(db: AsyncSession) -> CachedPayload:
+    """Monta o payload (já serializado) do GET /api/categories"""
+    from .models import Category
+    
+    # Só as colunas usadas, como tuplas (sem instanciar objetos ORM)
+    categories = (await db.execute(
+        select(
+            Category.id, Category.name_pt, Category.name_en, Category.name_es,
+            Category.created_at
+        ).order_by(Category.id)
+    )).all()
+    
+    body = _dump_json({
+        "categories": [
+            {
+                "id": cat.id,
+                "name_pt": cat.name_pt,
+                "name_en": cat.name_en,
+                "name_es": cat.name_es,
+                "created_at": cat.created_at.isoformat() if cat.created_at else None
+            }
+            for cat in categories
+        ],
+        "total": len(categories)
+    })
+    return CachedPayload(
+        body=body,
+        etag=etag_for_bytes(body)
+    )
+
 @app.get("/api/categories")
-async def get_categories(db: Session = Depends(get_db)):
-    """Listar todas as categorias"""
+async def get_categories(request: Request, db: AsyncSession = Depends(get_async_db)):
+    """Listar todas as categorias (servido do cache em memória, com ETag)"""
     try:
-        
-        from .models import Category
-        
-        
-        categories = db.query(Category).all()
-        
-        
-        return {
-            "categories": [
-                {
-                    "id": cat.id,
-                    "name_pt": cat.name_pt,
-                    "name_en": cat.name_en,
-                    "name_es": cat.name_es,
-                    "created_at": cat.created_at.isoformat() if cat.created_at else None
-                }
-                for cat in categories
-            ],
-            "total": len(categories)
-        }
+        payload = await category_cache.get_or_load(lambda: _load_categories(db))
+        if is_not_modified(request, payload.etag):
+            return not_modified(payload.etag)
+        
+        return Response(
+            content=payload.body,
+            media_type="application/json",
+            headers=cache_headers(payload.etag)
+        )
     except Exception as e:
         return {"error": str(e), "categories": [], "total": 0}
 
 @app.post("/api/categories")
-async def create_category(category_data: dict, db: Session = Depends(get_db), current_user: User = Depends(get_current_admin_user)):
+async def create_category(category_data: dict, db: AsyncSession = Depends(get_async_db), current_user: CurrentUser = Depends(get_current_admin_user)):
     """Criar nova categoria"""
     try:
         
@@ -128,9 +226,9 @@ async def create_category(category_data: dict, db: Session = Depends(get_db), cu
         
         
         # Verificar se já existe categoria com mesmo nome
-        existing = db.query(Category).filter(
-            Category.name_pt == category_data['name_pt']
-        ).first()
+        existing = (await db.execute(
+            select(Category).filter(Category.name_pt == category_data['name_pt'])
+        )).scalars().first()
         
         if existing:
             
@@ -147,8 +245,9 @@ async def create_category(category_data: dict, db: Session = Depends(get_db), cu
         )
         
         db.add(category)
-        db.commit()
-        db.refresh(category)
+        await db.commit()
+        await db.refresh(category)
+        category_cache.invalidate()
         
         
         return {
@@ -168,14 +267,14 @@ async def create_category(category_data: dict, db: Session = Depends(get_db), cu
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.put("/api/categories/{category_id}")
-async def update_category(category_id: int, category_data: dict, db: Session = Depends(get_db), current_user: User = Depends(get_current_admin_user)):
+async def update_category(category_id: int, category_data: dict, db: AsyncSession = Depends(get_async_db), current_user: CurrentUser = Depends(get_current_admin_user)):
     """Atualizar categoria"""
     try:
         
         from .models import Category
         
         
-        category = db.query(Category).filter(Category.id == category_id).first()
+        category = await db.get(Category, category_id)
         
         if not category:
             
@@ -189,8 +288,9 @@ async def update_category(category_id: int, category_data: dict, db: Session = D
         if 'name_es' in category_data:
             category.name_es = category_data['name_es']
         
-        db.commit()
-        db.refresh(category)
+        await db.commit()
+        await db.refresh(category)
+        category_cache.invalidate()
         
         
         return {
@@ -210,14 +310,14 @@ async def update_category(category_id: int, category_data: dict, db: Session = D
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/categories/{category_id}")
-async def get_category_by_id(category_id: int, db: Session = Depends(get_db)):
+async def get_category_by_id(category_id: int, db: AsyncSession = Depends(get_read_db)):
     """Obter categoria por ID"""
     try:
         
         from .models import Category
         
         
-        category = db.query(Category).filter(Category.id == category_id).first()
+        category = await db.get(Category, category_id)
         
         
         if not category:
@@ -238,21 +338,23 @@ async def get_category_by_id(category_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.delete("/api/categories/{category_id}")
-async def delete_category(category_id: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_admin_user)):
+async def delete_category(category_id: int, db: AsyncSession = Depends(get_async_db), current_user: CurrentUser = Depends(get_current_admin_user)):
     """Deletar categoria"""
     try:
         
         from .models import Category, Recipe
         
         
-        category = db.query(Category).filter(Category.id == category_id).first()
+        category = await db.get(Category, category_id)
         
         if not category:
             
             raise HTTPException(status_code=404, detail="Categoria não encontrada")
         
         # Verificar se há receitas usando esta categoria
-        recipes_count = db.query(Recipe).filter(Recipe.category_id == category_id).count()
+        recipes_count = await db.scalar(
+            select(func.count(Recipe.id)).filter(Recipe.category_id == category_id)
+        )
         if recipes_count > 0:
             
             raise HTTPException(
@@ -260,8 +362,9 @@ async def delete_category(category_id: int, db: Session = Depends(get_db), curre
                 detail=f"Não é possível deletar. Existem {recipes_count} receitas usando esta categoria."
             )
         
-        db.delete(category)
-        db.commit()
+        await db.delete(category)
+        await db.commit()
+        category_cache.invalidate()
         
         
         return {"message": "Categoria deletada com sucesso!"}
@@ -273,101 +376,203 @@ async def delete_category(category_id: int, db: Session = Depends(get_db), curre
 
 # ==================== RECEITAS ====================
 
+_EMPTY_IMAGE_URLS = {"thumbnail_url": "", "medium_url": "", "large_url": ""}
+
+def _serialize_recipes(rows, keys) -> list:
+    """
+    Serializa receitas (linhas com as colunas de projection_columns) nas chaves
+    de resolve_fields, já com as URLs das variantes da imagem montadas em lote
+    (evita uma chamada a /api/images/url por card).
+    """
+    from .services.recipe_service import IMAGE_URL_FIELDS
+    
+    with_urls = any(key in IMAGE_URL_FIELDS for key in keys)
+    urls = CloudinaryService.get_image_urls_many(row.image_url for row in rows) if with_urls else {}
+    items = []
+    for row in rows:
+        data = row._asdict()
+        created_at = data["created_at"]
+        data["created_at"] = created_at.isoformat() if created_at else None
+        if with_urls:
+            data.update(urls.get(data["image_url"], _EMPTY_IMAGE_URLS))
+        items.append({key: data[key] for key in keys})
+    return items
+
 @app.get("/api/recipes")
 async def get_recipes(
-    db: Session = Depends(get_db),
-    skip: int = 0,
-    limit: int = 100,
+    request: Request,
+    db: AsyncSession = Depends(get_read_db),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=100),
     category_id: Optional[int] = None,
-    search: Optional[str] = None
+    search: Optional[str] = None,
+    lang: Optional[str] = None,
+    fields: Optional[str] = None,
+    cursor: Optional[str] = None
 ):
-    """Listar receitas com filtros"""
+    """
+    Listar receitas com filtros.
+    
+    `search` usa a busca full-text (título e descrição, sem acentos), ordenada
+    por relevância; `lang` (pt, en, es) restringe a busca a um idioma.
+    
+    `lang` também restringe a resposta aos textos do idioma (title_pt e
+    description_pt para pt) e `fields` (ex.: id,title,thumbnail_url) escolhe os
+    campos; só as colunas necessárias são lidas do banco.
+    
+    Sem `cursor`: paginação clássica skip/limit (clientes antigos).
+    Com `cursor` (vazio na primeira página): paginação por cursor ordenada por
+    (created_at, id) decrescente; use o `next_cursor` retornado para a próxima página.
+    
+    Responde 304 quando o If-None-Match bate com o ETag da página.
+    """
     try:
         
-        from .models import Recipe
-        
-        
-        query = db.query(Recipe)
-        
-        # Filtrar por categoria
-        if category_id:
-            query = query.filter(Recipe.category_id == category_id)
-        
-        # Filtrar por busca
-        if search:
-            search_filter = f"%{search}%"
-            query = query.filter(
-                Recipe.title_pt.ilike(search_filter) |
-                Recipe.title_en.ilike(search_filter) |
-                Recipe.title_es.ilike(search_filter)
+        from .services.recipe_service import RecipeService, projection_columns, resolve_fields
+        from .search import resolve_lang
+        
+        try:
+            lang = resolve_lang(lang)
+            keys = resolve_fields(fields, lang)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        columns = projection_columns(keys)
+        
+        # Paginação por cursor (keyset)
+        if cursor is not None:
+            try:
+                query = RecipeService.keyset_query(cursor, limit, category_id, search, lang, columns=columns)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+            
+            rows = (await db.execute(query)).all()
+            recipes, next_cursor = RecipeService.split_page(list(rows), limit)
+            
+            etag = make_etag(
+                "recipes", cursor, limit, category_id, search, lang, keys, next_cursor,
+                [(recipe.id, recipe.updated_at) for recipe in recipes]
             )
-        
-        recipes = query.offset(skip).limit(limit).all()
-        total = query.count()
-        
-        
-        return {
-            "recipes": [
-                {
-                    "id": recipe.id,
-                    "title_pt": recipe.title_pt,
-                    "title_en": recipe.title_en,
-                    "title_es": recipe.title_es,
-                    "description_pt": recipe.description_pt,
-                    "description_en": recipe.description_en,
-                    "description_es": recipe.description_es,
-                    "image_url": recipe.image_url,
-                    "difficulty": recipe.difficulty,
-                    "prep_time_minutes": recipe.prep_time_minutes,
-                    "category_id": recipe.category_id,
-                    "created_at": recipe.created_at.isoformat() if recipe.created_at else None
-                }
-                for recipe in recipes
-            ],
-            "total": total,
-            "skip": skip,
-            "limit": limit
-        }
+            if is_not_modified(request, etag):
+                return not_modified(etag)
+            
+            with timed("serialize"):
+                return FastJSONResponse({
+                    "recipes": _serialize_recipes(recipes, keys),
+                    "next_cursor": next_cursor,
+                    "limit": limit
+                }, headers=cache_headers(etag))
+        
+        query = RecipeService.apply_filters(select(*columns), category_id, search, lang)
+        ordered = RecipeService.order_by_relevance(query, search, lang)
+        
+        recipes = (await db.execute(ordered.offset(skip).limit(limit))).all()
+        total = await db.scalar(select(func.count()).select_from(query.subquery()))
+        
+        etag = make_etag(
+            "recipes", skip, limit, category_id, search, lang, keys, total,
+            [(recipe.id, recipe.updated_at) for recipe in recipes]
+        )
+        if is_not_modified(request, etag):
+            return not_modified(etag)
+        
+        with timed("serialize"):
+            return FastJSONResponse({
+                "recipes": _serialize_recipes(recipes, keys),
+                "total": total,
+                "skip": skip,
+                "limit": limit
+            }, headers=cache_headers(etag))
+    except HTTPException:
+        raise
     except Exception as e:
         return {"error": str(e), "recipes": [], "total": 0}
 
+@app.get("/api/recipes/suggest")
+async def suggest_recipes(
+    q: str = "",
+    lang: str = "pt",
+    limit: int = Query(8, ge=1, le=20),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Sugestões para a caixa de busca (apenas id e título, tolera erros de digitação)"""
+    from .search import resolve_lang, suggest_query
+    
+    try:
+        lang = resolve_lang(lang) or "pt"
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    term = q.strip()
+    if len(term) < 2:
+        return {"suggestions": []}
+    
+    rows = (await db.execute(suggest_query(term, lang, limit))).all()
+    
+    return {
+        "suggestions": [{"id": row.id, "title": row.title} for row in rows]
+    }
+
+@app.get("/api/recipes/export")
+async def export_recipes(
+    format: str = "ndjson",
+    category_id: Optional[int] = None,
+    current_user: CurrentUser = Depends(get_current_admin_user)
+):
+    """Exportar o catálogo em streaming (NDJSON ou CSV), com filtro opcional de categoria"""
+    from .services.recipe_export import FORMATS, stream_recipes
+    
+    fmt = (format or "ndjson").lower()
+    if fmt not in FORMATS:
+        raise HTTPException(status_code=400, detail="Formato inválido. Use ndjson ou csv")
+    
+    return StreamingResponse(
+        stream_recipes(fmt, category_id),
+        media_type=FORMATS[fmt],
+        headers={"Content-Disposition": f'attachment; filename="recipes.{fmt}"'}
+    )
+
 @app.get("/api/recipes/{recipe_id}")
-async def get_recipe_by_id(recipe_id: int, db: Session = Depends(get_db)):
-    """Obter receita por ID"""
+async def get_recipe_by_id(
+    recipe_id: int,
+    request: Request,
+    lang: Optional[str] = None,
+    fields: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Obter receita por ID (com ETag / Last-Modified; `lang` e `fields` como na listagem)"""
     try:
         
         from .models import Recipe
+        from .services.recipe_service import projection_columns, resolve_fields
         
+        try:
+            keys = resolve_fields(fields, lang)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
         
-        recipe = db.query(Recipe).filter(Recipe.id == recipe_id).first()
+        recipe = (await db.execute(
+            select(*projection_columns(keys)).where(Recipe.id == recipe_id)
+        )).first()
         
         
         if not recipe:
             raise HTTPException(status_code=404, detail="Receita não encontrada")
         
-        return {
-            "recipe": {
-                "id": recipe.id,
-                "title_pt": recipe.title_pt,
-                "title_en": recipe.title_en,
-                "title_es": recipe.title_es,
-                "description_pt": recipe.description_pt,
-                "description_en": recipe.description_en,
-                "description_es": recipe.description_es,
-                "image_url": recipe.image_url,
-                "difficulty": recipe.difficulty,
-                "prep_time_minutes": recipe.prep_time_minutes,
-                "category_id": recipe.category_id,
-                "created_at": recipe.created_at.isoformat() if recipe.created_at else None
-            }
-        }
+        etag = make_etag("recipe", recipe.id, recipe.updated_at, keys)
+        if is_not_modified(request, etag, recipe.updated_at):
+            return not_modified(etag, recipe.updated_at)
+        
+        with timed("serialize"):
+            return FastJSONResponse({
+                "recipe": _serialize_recipes([recipe], keys)[0]
+            }, headers=cache_headers(etag, recipe.updated_at))
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/api/recipes")
-async def create_recipe(recipe_data: dict, db: Session = Depends(get_db), current_user: User = Depends(get_current_admin_user)):
+async def create_recipe(recipe_data: dict, db: AsyncSession = Depends(get_async_db), current_user: CurrentUser = Depends(get_current_admin_user)):
     """Criar nova receita"""
     try:
         
@@ -390,7 +595,7 @@ async def create_recipe(recipe_data: dict, db: Session = Depends(get_db), curren
         
         
         # Verificar se a categoria existe
-        category = db.query(Category).filter(Category.id == recipe_data['category_id']).first()
+        category = await db.get(Category, recipe_data['category_id'])
         if not category:
             
             raise HTTPException(status_code=400, detail="Categoria não encontrada")
@@ -415,8 +620,8 @@ async def create_recipe(recipe_data: dict, db: Session = Depends(get_db), curren
         )
         
         db.add(recipe)
-        db.commit()
-        db.refresh(recipe)
+        await db.commit()
+        await db.refresh(recipe)
         
         
         return {
@@ -435,15 +640,85 @@ async def create_recipe(recipe_data: dict, db: Session = Depends(get_db), curren
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/api/recipes/bulk")
+async def bulk_import_recipes(
+    request: Request,
+    format: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentUser = Depends(get_current_admin_user)
+):
+    """
+    Importar receitas em lote (NDJSON ou CSV, pelo Content-Type ou ?format=).
+    
+    Linhas válidas são inseridas em lotes numa única transação; as inválidas
+    voltam no relatório `errors` com o número da linha.
+    """
+    import tempfile
+    from sqlalchemy import insert
+    from starlette.concurrency import run_in_threadpool
+    from .models import Recipe, Category
+    from .services.recipe_import import collect_category_ids, detect_format, iter_rows, read_batch
+    
+    try:
+        fmt = detect_format(request.headers.get("content-type"), format)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    with tempfile.SpooledTemporaryFile(max_size=1024 * 1024) as body:
+        size = 0
+        async for chunk in request.stream():
+            size += len(chunk)
+            if size > settings.max_import_bytes:
+                raise HTTPException(status_code=413, detail="Arquivo de importação muito grande")
+            body.write(chunk)
+        
+        # Uma query para todas as categorias referenciadas
+        try:
+            referenced = await run_in_threadpool(collect_category_ids, body, fmt)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        existing = set()
+        if referenced:
+            existing = set((await db.execute(
+                select(Category.id).filter(Category.id.in_(referenced))
+            )).scalars().all())
+        
+        inserted = 0
+        errors = []
+        rows = iter_rows(body, fmt)
+        try:
+            while True:
+                # Validação no threadpool, um lote por vez; o insert no event loop
+                batch = await run_in_threadpool(read_batch, rows, existing, errors)
+                if not batch:
+                    break
+                await db.execute(insert(Recipe), batch)
+                inserted += len(batch)
+            
+            await db.commit()
+        except Exception as e:
+            await db.rollback()
+            raise HTTPException(status_code=500, detail=str(e))
+        finally:
+            rows.close()
+    
+    return {
+        "message": f"{inserted} receitas importadas",
+        "format": fmt,
+        "inserted": inserted,
+        "failed": len(errors),
+        "errors": errors
+    }
+
 @app.put("/api/recipes/{recipe_id}")
-async def update_recipe(recipe_id: int, recipe_data: dict, db: Session = Depends(get_db), current_user: User = Depends(get_current_admin_user)):
+async def update_recipe(recipe_id: int, recipe_data: dict, db: AsyncSession = Depends(get_async_db), current_user: CurrentUser = Depends(get_current_admin_user)):
     """Atualizar receita"""
     try:
         
         from .models import Recipe, Category
         
         
-        recipe = db.query(Recipe).filter(Recipe.id == recipe_id).first()
+        recipe = await db.get(Recipe, recipe_id)
         
         if not recipe:
             
@@ -451,7 +726,7 @@ async def update_recipe(recipe_id: int, recipe_data: dict, db: Session = Depends
         
         # Verificar categoria se fornecida
         if 'category_id' in recipe_data:
-            category = db.query(Category).filter(Category.id == recipe_data['category_id']).first()
+            category = await db.get(Category, recipe_data['category_id'])
             if not category:
                 
                 raise HTTPException(status_code=400, detail="Categoria não encontrada")
@@ -473,8 +748,8 @@ async def update_recipe(recipe_id: int, recipe_data: dict, db: Session = Depends
             if field in recipe_data:
                 setattr(recipe, field, recipe_data[field])
         
-        db.commit()
-        db.refresh(recipe)
+        await db.commit()
+        await db.refresh(recipe)
         
         
         return {
@@ -494,21 +769,21 @@ async def update_recipe(recipe_id: int, recipe_data: dict, db: Session = Depends
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.delete("/api/recipes/{recipe_id}")
-async def delete_recipe(recipe_id: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_admin_user)):
+async def delete_recipe(recipe_id: int, db: AsyncSession = Depends(get_async_db), current_user: CurrentUser = Depends(get_current_admin_user)):
     """Deletar receita"""
     try:
         
         from .models import Recipe
         
         
-        recipe = db.query(Recipe).filter(Recipe.id == recipe_id).first()
+        recipe = await db.get(Recipe, recipe_id)
         
         if not recipe:
             
             raise HTTPException(status_code=404, detail="Receita não encontrada")
         
-        db.delete(recipe)
-        db.commit()
+        await db.delete(recipe)
+        await db.commit()
         
         
         return {"message": "Receita deletada com sucesso!"}
@@ -521,25 +796,40 @@ async def delete_recipe(recipe_id: int, db: Session = Depends(get_db), current_u
 # ==================== ESTATÍSTICAS ====================
 
 @app.get("/api/stats")
-async def get_stats(db: Session = Depends(get_db), current_user: User = Depends(get_current_admin_user)):
+async def get_stats(db: AsyncSession = Depends(get_async_db), current_user: CurrentUser = Depends(get_current_admin_user)):
     """Estatísticas gerais"""
     try:
         
-        from .models import Category, Recipe
+        from .services.stats_service import StatsService
         
         
-        categories_count = db.query(Category).count()
-        recipes_count = db.query(Recipe).count()
+        stats = await db.run_sync(StatsService.get_stats)
         
         
         return {
-            "total_categories": categories_count,
-            "total_recipes": recipes_count,
+            **stats,
             "status": "success"
         }
     except Exception as e:
         return {"error": str(e), "status": "error"}
 
+# ==================== RUNTIME ====================
+
+@app.get("/api/runtime/stats")
+async def get_runtime_stats(current_user: CurrentUser = Depends(get_current_admin_user)):
+    """Contadores internos do processo (caches em memória, pools)"""
+    return {
+        "pid": os.getpid(),
+        "caches": {
+            "categories": category_cache.stats(),
+            "users": user_cache.stats()
+        },
+        "database_pool": pool_stats(),
+        "read_replicas": replica_set.stats(),
+        "password_hashing": password_hash_pool.stats(),
+        "image_urls": CloudinaryService.url_cache_stats()
+    }
+
 # Manter endpoints antigos para compatibilidade
 @app.get("/api/test")
 async def test_api():
@@ -548,11 +838,11 @@ async def test_api():
 @app.get("/api/db-test")
 async def test_database():
     try:
-        from .database import engine, get_db
+        from .database import async_engine
         from sqlalchemy import text
         
-        with engine.connect() as connection:
-            result = connection.execute(text("SELECT 1 as test"))
+        async with async_engine.connect() as connection:
+            result = await connection.execute(text("SELECT 1 as test"))
             row = result.fetchone()
             return {"database": "connected", "test_query": "success", "result": row[0]}
     except Exception as e:
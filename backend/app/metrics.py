@@ -0,0 +1,174 @@
+"""
+Métricas no formato do Prometheus (GET /metrics).
+
+- requisições e latência por rota (o template, ex. /api/recipes/{recipe_id},
+  para não explodir a cardinalidade)
+- queries por requisição e tempo de banco por requisição (eventos do engine)
+- latência das chamadas ao Cloudinary
+- tempo de hash/verificação de senha (bcrypt)
+
+O middleware é ASGI puro e o custo por requisição é o de alguns observe()
+dos contadores. Com vários workers (app/server.py) cada processo grava os
+valores em PROMETHEUS_MULTIPROC_DIR e o /metrics soma todos os workers,
+qualquer que seja o que atende o scrape.
+"""
+import os
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Histogram, generate_latest, multiprocess
+from sqlalchemy import event
+
+# Rotas sem correspondência (404) entram num único rótulo
+UNMATCHED_ROUTE = "<unmatched>"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+HTTP_REQUESTS = Counter(
+    "shapeme_http_requests_total",
+    "Requisições HTTP por rota, método e status",
+    ["method", "route", "status"],
+)
+HTTP_LATENCY = Histogram(
+    "shapeme_http_request_duration_seconds",
+    "Latência das requisições HTTP por rota",
+    ["method", "route"],
+    buckets=LATENCY_BUCKETS,
+)
+DB_QUERIES = Counter(
+    "shapeme_db_queries_total",
+    "Queries executadas no banco",
+)
+DB_QUERY_LATENCY = Histogram(
+    "shapeme_db_query_duration_seconds",
+    "Duração de cada query",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0),
+)
+DB_QUERIES_PER_REQUEST = Histogram(
+    "shapeme_db_queries_per_request",
+    "Número de queries por requisição",
+    ["route"],
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100),
+)
+DB_TIME_PER_REQUEST = Histogram(
+    "shapeme_db_time_per_request_seconds",
+    "Tempo total de banco por requisição",
+    ["route"],
+    buckets=LATENCY_BUCKETS,
+)
+CLOUDINARY_LATENCY = Histogram(
+    "shapeme_cloudinary_duration_seconds",
+    "Latência das chamadas ao Cloudinary",
+    ["operation", "outcome"],
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+PASSWORD_HASH_LATENCY = Histogram(
+    "shapeme_password_hash_duration_seconds",
+    "Tempo de hash/verificação de senha (bcrypt)",
+    ["operation"],
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+
+
+class RequestDbStats:
+    """Acumulador da requisição atual (mutável: compartilhado com as threads/greenlets das queries)."""
+    __slots__ = ("queries", "seconds")
+
+    def __init__(self):
+        self.queries = 0
+        self.seconds = 0.0
+
+
+_request_db_stats: ContextVar[Optional[RequestDbStats]] = ContextVar("request_db_stats", default=None)
+
+
+def current_db_stats() -> Optional[RequestDbStats]:
+    return _request_db_stats.get()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get("query_start_time")
+    if not starts:
+        return
+    elapsed = time.perf_counter() - starts.pop()
+    DB_QUERIES.inc()
+    DB_QUERY_LATENCY.observe(elapsed)
+    stats = _request_db_stats.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.seconds += elapsed
+
+
+def instrument_engine(engine) -> None:
+    """Registra os eventos de query num engine síncrono (para o async, passar engine.sync_engine)."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def _route_template(scope) -> str:
+    route = scope.get("route")
+    path = getattr(route, "path", None)
+    if path:
+        return path
+    # Versões do Starlette que não expõem scope["route"]: procura pelo endpoint
+    endpoint = scope.get("endpoint")
+    app = scope.get("app")
+    if endpoint is not None and app is not None:
+        for candidate in app.router.routes:
+            if getattr(candidate, "endpoint", None) is endpoint:
+                return candidate.path
+    return UNMATCHED_ROUTE
+
+
+class MetricsMiddleware:
+    """Mede cada requisição HTTP (status, latência, queries e tempo de banco)."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        stats = RequestDbStats()
+        token = _request_db_stats.set(stats)
+        started = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            _request_db_stats.reset(token)
+            route = _route_template(scope)
+            method = scope["method"]
+            HTTP_REQUESTS.labels(method, route, str(status_code)).inc()
+            HTTP_LATENCY.labels(method, route).observe(elapsed)
+            DB_QUERIES_PER_REQUEST.labels(route).observe(stats.queries)
+            DB_TIME_PER_REQUEST.labels(route).observe(stats.seconds)
+
+
+def multiprocess_enabled() -> bool:
+    return bool(os.getenv("PROMETHEUS_MULTIPROC_DIR"))
+
+
+def render_metrics():
+    """Corpo e content-type da resposta do /metrics."""
+    if multiprocess_enabled():
+        # Agrega os arquivos de todos os workers (vivos e encerrados)
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(), CONTENT_TYPE_LATEST
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from ..base import Base
@@ -19,10 +19,11 @@ class Category(Base):
     __tablename__ = "categories"
     
     id = Column(Integer, primary_key=True, index=True)
-    name_pt = Column(String, nullable=False)
+    name_pt = Column(String, nullable=False, index=True)  # nome duplicado é verificado a cada criação
     name_en = Column(String, nullable=False)
     name_es = Column(String, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     
     recipes = relationship("Recipe", back_populates="category")
 
@@ -39,7 +40,13 @@ class Recipe(Base):
     image_url = Column(String)
     difficulty = Column(Integer)  # 1-5
     prep_time_minutes = Column(Integer)
-    category_id = Column(Integer, ForeignKey("categories.id"))
+    category_id = Column(Integer, ForeignKey("categories.id"), index=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     
-    category = relationship("Category", back_populates="recipes")
\ No newline at end of file
+    category = relationship("Category", back_populates="recipes")
+    
+    __table_args__ = (
+        # Paginação por cursor: ORDER BY created_at DESC, id DESC
+        Index("ix_recipes_created_at_id", "created_at", "id"),
+    )
\ No newline at end of file
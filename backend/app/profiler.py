@@ -0,0 +1,167 @@
+"""
+Profiler de SQL por requisição (opcional, para desenvolvimento: SQL_PROFILER=true).
+
+Registra cada statement executado durante a requisição e:
+- adiciona o cabeçalho Server-Timing (db, serialize, total), visível na aba
+  Network do navegador;
+- marca como suspeita de N+1 a query repetida SQL_PROFILER_N_PLUS_ONE vezes
+  ou mais (os statements usam bind params, então o texto é o mesmo);
+- com SQL_PROFILER_EXPLAIN_MS > 0, guarda o EXPLAIN dos SELECTs mais lentos
+  que o limite e registra no log junto com o resumo da requisição.
+
+Desligado, nada é registrado no engine e `timed()` só consulta uma ContextVar.
+"""
+import logging
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import List, Optional, Tuple
+
+from sqlalchemy import event
+
+from .config import settings
+
+logger = logging.getLogger("shapeme.profiler")
+
+# Statements guardados por requisição (além disso só os totais são contados)
+MAX_RECORDED_STATEMENTS = 500
+
+
+class RequestProfile:
+    """Queries e fases medidas durante uma requisição."""
+
+    def __init__(self):
+        self.statements: List[Tuple[str, float]] = []
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.phases = {}
+        self.plans: List[Tuple[str, float, str]] = []
+        self._depth = {}
+
+    def record_statement(self, statement: str, seconds: float) -> None:
+        self.queries += 1
+        self.db_seconds += seconds
+        if len(self.statements) < MAX_RECORDED_STATEMENTS:
+            self.statements.append((statement, seconds))
+
+    def n_plus_one_suspects(self, threshold: int) -> List[Tuple[str, int]]:
+        counts = Counter(statement for statement, _ in self.statements)
+        return [(statement, count) for statement, count in counts.most_common() if count >= threshold]
+
+
+_current_profile: ContextVar[Optional[RequestProfile]] = ContextVar("sql_profile", default=None)
+
+
+@contextmanager
+def timed(phase: str):
+    """Acumula o tempo do bloco na fase (ex.: "serialize"). Blocos aninhados da mesma fase contam uma vez."""
+    profile = _current_profile.get()
+    if profile is None or profile._depth.get(phase):
+        yield
+        return
+    profile._depth[phase] = 1
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile._depth[phase] = 0
+        profile.phases[phase] = profile.phases.get(phase, 0.0) + time.perf_counter() - started
+
+
+def _explain(conn, statement: str, parameters) -> str:
+    # Cursor direto do DBAPI: não passa pelos eventos do engine
+    cursor = conn.connection.cursor()
+    try:
+        cursor.execute("EXPLAIN " + statement, parameters)
+        return "\n".join(str(row[0]) for row in cursor.fetchall())
+    finally:
+        cursor.close()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_profile.get() is not None:
+        conn.info.setdefault("profiler_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get("profiler_start_time")
+    if not starts:
+        return
+    elapsed = time.perf_counter() - starts.pop()
+    profile = _current_profile.get()
+    if profile is None:
+        return
+    profile.record_statement(statement, elapsed)
+
+    explain_ms = settings.sql_profiler_explain_ms
+    if (
+        explain_ms > 0
+        and elapsed * 1000 >= explain_ms
+        and not executemany
+        and statement.lstrip()[:6].upper() == "SELECT"
+    ):
+        try:
+            profile.plans.append((statement, elapsed, _explain(conn, statement, parameters)))
+        except Exception as e:
+            profile.plans.append((statement, elapsed, f"EXPLAIN falhou: {e}"))
+
+
+def instrument_engine(engine) -> None:
+    """Registra o profiler num engine síncrono (para o async, passar engine.sync_engine)."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def _server_timing(profile: RequestProfile, total: float) -> bytes:
+    parts = [f'db;dur={profile.db_seconds * 1000:.1f};desc="{profile.queries} queries"']
+    for phase, seconds in profile.phases.items():
+        parts.append(f"{phase};dur={seconds * 1000:.1f}")
+    parts.append(f"total;dur={total * 1000:.1f}")
+    return ", ".join(parts).encode("latin-1")
+
+
+def _shorten(statement: str, size: int = 300) -> str:
+    statement = " ".join(statement.split())
+    return statement if len(statement) <= size else statement[:size] + "..."
+
+
+class SqlProfilerMiddleware:
+    """Perfil de SQL de cada requisição HTTP (Server-Timing, N+1 e planos lentos)."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile()
+        token = _current_profile.set(profile)
+        started = time.perf_counter()
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", _server_timing(profile, time.perf_counter() - started)))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current_profile.reset(token)
+            self._report(scope, profile, time.perf_counter() - started)
+
+    @staticmethod
+    def _report(scope, profile: RequestProfile, total: float) -> None:
+        request = f'{scope["method"]} {scope["path"]}'
+        for statement, count in profile.n_plus_one_suspects(settings.sql_profiler_n_plus_one):
+            logger.warning("Possível N+1 em %s: %d execuções de %s", request, count, _shorten(statement))
+        for statement, seconds, plan in profile.plans:
+            logger.warning("Query lenta em %s (%.1f ms): %s\n%s", request, seconds * 1000, _shorten(statement), plan)
+        logger.info(
+            "%s: %d queries, db %.1f ms, total %.1f ms",
+            request, profile.queries, profile.db_seconds * 1000, total * 1000,
+        )
@@ -0,0 +1,160 @@
+"""
+Réplicas de leitura (READ_DATABASE_URLS).
+
+As rotas GET do catálogo usam `get_read_db`, que distribui as sessões entre as
+réplicas saudáveis em round-robin. Escritas continuam no primário
+(`get_async_db`). A saúde de cada réplica (SELECT com o atraso de replicação)
+é verificada pelo prober do /readyz; sem réplica saudável a leitura volta
+para o primário.
+
+Read-your-writes: depois de uma escrita bem-sucedida o cliente recebe um
+cookie curto (READ_YOUR_WRITES_SECONDS) e, enquanto ele valer, as leituras
+dele vão para o primário. O cabeçalho `X-Read-Consistency: primary` força o
+mesmo comportamento em qualquer requisição.
+"""
+import asyncio
+import itertools
+import time
+from typing import List, Optional
+
+from fastapi import Request
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from .config import settings
+from .database import AsyncSessionLocal, create_pooled_async_engine, describe_pool
+
+READ_YOUR_WRITES_COOKIE = "shapeme_primary_until"
+CONSISTENCY_HEADER = "x-read-consistency"
+WRITE_METHODS = ("POST", "PUT", "PATCH", "DELETE")
+
+# Atraso de replicação em segundos (0 quando a réplica já aplicou tudo o que recebeu)
+REPLICATION_LAG_SQL = text("""
+    SELECT CASE
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+    END
+""")
+
+
+class Replica:
+    def __init__(self, url: str):
+        parsed = make_url(url)
+        # Sem usuário/senha: o nome aparece em /readyz e /api/runtime/stats
+        self.name = f"{parsed.host}:{parsed.port or 5432}/{parsed.database}"
+        self.engine: AsyncEngine = create_pooled_async_engine(url)
+        # Saudável até a primeira verificação dizer o contrário
+        self.healthy = True
+        self.lag_seconds: Optional[float] = None
+        self.error: Optional[str] = None
+        self.checked_at: Optional[float] = None
+
+
+class ReplicaSet:
+    """Réplicas configuradas, com round-robin entre as saudáveis."""
+
+    def __init__(self, urls: List[str]):
+        self.replicas = [Replica(url) for url in urls]
+        self._counter = itertools.count()
+        self.routed = 0
+        self.fallbacks = 0
+
+    def __bool__(self) -> bool:
+        return bool(self.replicas)
+
+    @property
+    def engines(self) -> List[AsyncEngine]:
+        return [replica.engine for replica in self.replicas]
+
+    def choose(self) -> Optional[AsyncEngine]:
+        """Próxima réplica saudável, ou None (usar o primário)."""
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        if not healthy:
+            self.fallbacks += 1
+            return None
+        self.routed += 1
+        return healthy[next(self._counter) % len(healthy)].engine
+
+    async def _check(self, replica: Replica, timeout: float) -> None:
+        try:
+            async def probe():
+                async with replica.engine.connect() as connection:
+                    return await connection.scalar(REPLICATION_LAG_SQL)
+            lag = await asyncio.wait_for(probe(), timeout=timeout)
+            replica.lag_seconds = float(lag) if lag is not None else 0.0
+            replica.error = None
+            replica.healthy = replica.lag_seconds <= settings.replica_max_lag_seconds
+            if not replica.healthy:
+                replica.error = f"atraso de replicação de {replica.lag_seconds:.1f}s"
+        except Exception as e:
+            replica.healthy = False
+            replica.lag_seconds = None
+            replica.error = str(e) or type(e).__name__
+        replica.checked_at = time.time()
+
+    async def check(self, timeout: float) -> None:
+        """Verifica todas as réplicas em paralelo (chamado pelo prober do /readyz)."""
+        await asyncio.gather(*[self._check(replica, timeout) for replica in self.replicas])
+
+    def stats(self) -> dict:
+        return {
+            "routed": self.routed,
+            "fallbacks_to_primary": self.fallbacks,
+            "replicas": [
+                {
+                    "name": replica.name,
+                    "healthy": replica.healthy,
+                    "lag_seconds": replica.lag_seconds,
+                    "error": replica.error,
+                    "checked_at": replica.checked_at,
+                    "pool": describe_pool(replica.engine.sync_engine.pool),
+                }
+                for replica in self.replicas
+            ],
+        }
+
+
+replica_set = ReplicaSet(settings.read_database_urls)
+
+
+def _wants_primary(request: Request) -> bool:
+    if request.headers.get(CONSISTENCY_HEADER, "").lower() == "primary":
+        return True
+    until = request.cookies.get(READ_YOUR_WRITES_COOKIE)
+    try:
+        return until is not None and float(until) > time.time()
+    except ValueError:
+        return False
+
+
+# Dependency de leitura: réplica saudável (round-robin) ou o primário
+async def get_read_db(request: Request):
+    engine = None if _wants_primary(request) else replica_set.choose()
+    session = AsyncSessionLocal(bind=engine) if engine is not None else AsyncSessionLocal()
+    async with session as db:
+        yield db
+
+
+class ReadYourWritesMiddleware:
+    """Marca o cliente com o cookie de read-your-writes após escritas bem-sucedidas."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in WRITE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                window = settings.read_your_writes_seconds
+                cookie = (
+                    f"{READ_YOUR_WRITES_COOKIE}={time.time() + window:.0f}; "
+                    f"Max-Age={window}; Path=/; HttpOnly; SameSite=Lax"
+                )
+                message = {**message, "headers": [*message.get("headers", []), (b"set-cookie", cookie.encode("latin-1"))]}
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
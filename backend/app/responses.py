@@ -0,0 +1,29 @@
+"""
+Serialização JSON das respostas.
+
+Com o orjson instalado, o corpo é gerado direto em bytes pelo encoder em C
+(várias vezes mais rápido que o json da stdlib nas listas de receitas).
+Sem ele, cai no json da stdlib com a mesma saída compacta e UTF-8.
+"""
+import json
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson é opcional
+    orjson = None
+
+
+def dump_json(data) -> bytes:
+    """Serializa como o JSONResponse do FastAPI (compacto, UTF-8)."""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse que serializa com dump_json (orjson quando disponível)."""
+
+    def render(self, content) -> bytes:
+        return dump_json(content)
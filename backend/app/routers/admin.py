@@ -1,43 +1,29 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from ..database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..database import get_async_db
 from ..services.category_service import CategoryService
 from ..services.recipe_service import RecipeService
+from ..services.stats_service import StatsService
+from ..services.maintenance_service import MaintenanceService
 from ..schemas.category import CategoryCreate
-from ..schemas.recipe import RecipeCreate
+from ..schemas.recipe import RecipeCreate, RecipeBulkDelete
+from ..auth_deps import get_current_admin_user
+from ..cache import category_cache
 
-router = APIRouter(prefix="/api/admin", tags=["Admin"])
+router = APIRouter(
+    prefix="/api/admin",
+    tags=["Admin"],
+    dependencies=[Depends(get_current_admin_user)],
+)
 
 @router.get("/stats")
-async def get_admin_stats(db: Session = Depends(get_db)):
+async def get_admin_stats(db: AsyncSession = Depends(get_async_db)):
     """Obter estatísticas para o dashboard admin"""
     try:
-        categories_count = CategoryService.get_categories_count(db=db)
-        recipes_count = RecipeService.get_recipes_count(db=db)
-        
-        # Estatísticas por categoria
-        categories = CategoryService.get_categories(db=db)
-        category_stats = []
-        
-        for category in categories:
-            recipes_in_category = RecipeService.get_recipes_by_category(
-                db=db, 
-                category_id=category.id
-            )
-            category_stats.append({
-                "category": {
-                    "id": category.id,
-                    "name_pt": category.name_pt,
-                    "name_en": category.name_en,
-                    "name_es": category.name_es
-                },
-                "recipes_count": len(recipes_in_category)
-            })
+        stats = await db.run_sync(StatsService.get_stats)
         
         return {
-            "total_categories": categories_count,
-            "total_recipes": recipes_count,
-            "category_stats": category_stats,
+            **stats,
             "status": "success"
         }
     except Exception as e:
@@ -47,16 +33,16 @@ async def get_admin_stats(db: Session = Depends(get_db)):
         )
 
 @router.post("/seed-data")
-async def seed_initial_data(db: Session = Depends(get_db)):
+async def seed_initial_data(db: AsyncSession = Depends(get_async_db)):
     """Criar dados iniciais para teste"""
     try:
         # Verificar se já existem dados
-        existing_categories = CategoryService.get_categories_count(db=db)
+        existing_categories = await db.run_sync(CategoryService.get_categories_count)
         if existing_categories > 0:
             return {
                 "message": "Dados já existem",
                 "categories": existing_categories,
-                "recipes": RecipeService.get_recipes_count(db=db)
+                "recipes": await db.run_sync(RecipeService.get_recipes_count)
             }
         
         # Criar categorias iniciais
@@ -90,11 +76,12 @@ async def seed_initial_data(db: Session = Depends(get_db)):
         
         created_categories = []
         for cat_data in categories_data:
-            category = CategoryService.create_category(
-                db=db, 
+            category = await db.run_sync(
+                CategoryService.create_category,
                 category=CategoryCreate(**cat_data)
             )
             created_categories.append(category)
+        category_cache.invalidate()
         
         # Criar receitas iniciais
         recipes_data = [
@@ -162,8 +149,8 @@ async def seed_initial_data(db: Session = Depends(get_db)):
         
         created_recipes = []
         for recipe_data in recipes_data:
-            recipe = RecipeService.create_recipe(
-                db=db,
+            recipe = await db.run_sync(
+                RecipeService.create_recipe,
                 recipe=RecipeCreate(**recipe_data)
             )
             created_recipes.append(recipe)
@@ -181,22 +168,49 @@ async def seed_initial_data(db: Session = Depends(get_db)):
             detail=f"Erro ao criar dados iniciais: {str(e)}"
         )
 
+@router.post("/recipes/bulk-delete")
+async def bulk_delete_recipes(payload: RecipeBulkDelete, db: AsyncSession = Depends(get_async_db)):
+    """Deletar várias receitas por id (um único DELETE)"""
+    try:
+        deleted = await db.run_sync(MaintenanceService.delete_recipes, recipe_ids=payload.ids)
+        return {
+            "recipes_deleted": deleted,
+            "status": "success"
+        }
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erro ao deletar receitas: {str(e)}"
+        )
+
+@router.delete("/categories/{category_id}/recipes")
+async def delete_category_recipes(category_id: int, db: AsyncSession = Depends(get_async_db)):
+    """Deletar todas as receitas de uma categoria (um único DELETE)"""
+    try:
+        deleted = await db.run_sync(MaintenanceService.delete_recipes_by_category, category_id=category_id)
+        return {
+            "recipes_deleted": deleted,
+            "status": "success"
+        }
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erro ao deletar receitas: {str(e)}"
+        )
+
 @router.delete("/reset-data")
-async def reset_all_data(db: Session = Depends(get_db)):
+async def reset_all_data(db: AsyncSession = Depends(get_async_db)):
     """CUIDADO: Deletar todos os dados (apenas para desenvolvimento)"""
     try:
-        # Deletar todas as receitas primeiro (devido à foreign key)
-        recipes = RecipeService.get_recipes(db=db, limit=1000)
-        for recipe in recipes:
-            RecipeService.delete_recipe(db=db, recipe_id=recipe.id)
-        
-        # Deletar todas as categorias
-        categories = CategoryService.get_categories(db=db, limit=1000)
-        for category in categories:
-            CategoryService.delete_category(db=db, category_id=category.id)
+        # Um DELETE por tabela, na mesma transação (receitas primeiro, devido à foreign key)
+        counts = await db.run_sync(MaintenanceService.reset_catalog)
+        category_cache.invalidate()
         
         return {
             "message": "Todos os dados foram deletados",
+            **counts,
             "status": "success"
         }
         
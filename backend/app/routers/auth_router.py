@@ -1,12 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import timedelta
 
-from ..database import get_db
+from ..database import get_async_db
 from ..schemas.user import Token
 from ..models import User
-from ..security import verify_password, create_access_token
+from ..security import PasswordHashPoolBusy, verify_and_update_password, create_access_token
 from ..config import settings
 
 router = APIRouter(
@@ -17,17 +18,36 @@ router = APIRouter(
 @router.post("/token", response_model=Token)
 async def login_for_access_token(
     form_data: OAuth2PasswordRequestForm = Depends(), 
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    user = db.query(User).filter(User.email == form_data.username).first()
+    user = (await db.execute(
+        select(User).filter(User.email == form_data.username)
+    )).scalars().first()
     
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    valid, new_hash = False, None
+    if user:
+        try:
+            # bcrypt roda no pool dedicado, fora do event loop
+            valid, new_hash = await verify_and_update_password(form_data.password, user.hashed_password)
+        except PasswordHashPoolBusy as e:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=str(e),
+                headers={"Retry-After": "1"},
+            )
+    
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Credenciais inválidas",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    # Custo do bcrypt mudou: regrava o hash com o custo atual
+    if new_hash:
+        user.hashed_password = new_hash
+        await db.commit()
+    
     # Criar token de acesso
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
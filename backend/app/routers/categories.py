@@ -1,29 +1,33 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
-from ..database import get_db
+from ..database import get_async_db
+from ..replicas import get_read_db
 from ..schemas.category import CategoryCreate, CategoryUpdate, CategoryResponse
 from ..services.category_service import CategoryService
+from ..cache import category_cache
 
 router = APIRouter(prefix="/api/categories", tags=["Categories"])
 
 @router.post("/", response_model=CategoryResponse, status_code=status.HTTP_201_CREATED)
 async def create_category(
     category: CategoryCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Criar uma nova categoria"""
-    return CategoryService.create_category(db=db, category=category)
+    created = await db.run_sync(CategoryService.create_category, category=category)
+    category_cache.invalidate()
+    return created
 
 @router.get("/", response_model=dict)
 async def get_categories(
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Listar todas as categorias"""
-    categories = CategoryService.get_categories(db=db, skip=skip, limit=limit)
-    total = CategoryService.get_categories_count(db=db)
+    categories = await db.run_sync(CategoryService.get_categories, skip=skip, limit=limit)
+    total = await db.run_sync(CategoryService.get_categories_count)
     
     return {
         "categories": categories,
@@ -35,10 +39,10 @@ async def get_categories(
 @router.get("/{category_id}", response_model=CategoryResponse)
 async def get_category(
     category_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Obter uma categoria específica"""
-    category = CategoryService.get_category(db=db, category_id=category_id)
+    category = await db.run_sync(CategoryService.get_category, category_id=category_id)
     if not category:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -50,14 +54,15 @@ async def get_category(
 async def update_category(
     category_id: int,
     category_update: CategoryUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Atualizar uma categoria"""
-    category = CategoryService.update_category(
-        db=db, 
+    category = await db.run_sync(
+        CategoryService.update_category,
         category_id=category_id, 
         category_update=category_update
     )
+    category_cache.invalidate()
     if not category:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -68,10 +73,11 @@ async def update_category(
 @router.delete("/{category_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_category(
     category_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Deletar uma categoria"""
-    success = CategoryService.delete_category(db=db, category_id=category_id)
+    success = await db.run_sync(CategoryService.delete_category, category_id=category_id)
+    category_cache.invalidate()
     if not success:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -1,21 +1,23 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
-from ..database import get_db
+from ..database import get_async_db
+from ..replicas import get_read_db
 from ..schemas.recipe import RecipeCreate, RecipeUpdate, RecipeResponse
 from ..services.recipe_service import RecipeService
 from ..services.category_service import CategoryService
+from ..search import resolve_lang
 
 router = APIRouter(prefix="/api/recipes", tags=["Recipes"])
 
 @router.post("/", response_model=RecipeResponse, status_code=status.HTTP_201_CREATED)
 async def create_recipe(
     recipe: RecipeCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Criar uma nova receita"""
     # Verificar se a categoria existe
-    category = CategoryService.get_category(db=db, category_id=recipe.category_id)
+    category = await db.run_sync(CategoryService.get_category, category_id=recipe.category_id)
     if not category:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -29,7 +31,7 @@ async def create_recipe(
             detail="Dificuldade deve ser entre 1 e 5"
         )
     
-    return RecipeService.create_recipe(db=db, recipe=recipe)
+    return await db.run_sync(RecipeService.create_recipe, recipe=recipe)
 
 @router.get("/", response_model=dict)
 async def get_recipes(
@@ -37,17 +39,55 @@ async def get_recipes(
     limit: int = Query(100, ge=1, le=100),
     category_id: Optional[int] = Query(None),
     search: Optional[str] = Query(None),
-    db: Session = Depends(get_db)
+    lang: Optional[str] = Query(None),
+    cursor: Optional[str] = Query(None),
+    db: AsyncSession = Depends(get_read_db)
 ):
-    """Listar receitas com filtros opcionais"""
-    recipes = RecipeService.get_recipes(
-        db=db, 
+    """Listar receitas com filtros opcionais (skip/limit ou cursor)"""
+    try:
+        lang = resolve_lang(lang)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    if cursor is not None:
+        try:
+            recipes, next_cursor = await db.run_sync(
+                RecipeService.get_recipes_page,
+                cursor=cursor,
+                limit=limit,
+                category_id=category_id,
+                search=search,
+                lang=lang
+            )
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+        
+        return {
+            "recipes": recipes,
+            "next_cursor": next_cursor,
+            "limit": limit,
+            "filters": {
+                "category_id": category_id,
+                "search": search,
+                "lang": lang
+            }
+        }
+    
+    recipes = await db.run_sync(
+        RecipeService.get_recipes,
         skip=skip, 
         limit=limit,
         category_id=category_id,
-        search=search
+        search=search,
+        lang=lang
     )
-    total = RecipeService.get_recipes_count(db=db)
+    total = await db.run_sync(RecipeService.get_recipes_count)
     
     return {
         "recipes": recipes,
@@ -56,17 +96,35 @@ async def get_recipes(
         "limit": limit,
         "filters": {
             "category_id": category_id,
-            "search": search
+            "search": search,
+            "lang": lang
         }
     }
 
+@router.get("/suggest", response_model=dict)
+async def suggest_recipes(
+    q: str = Query(""),
+    lang: str = Query("pt"),
+    limit: int = Query(8, ge=1, le=20),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Sugestões para a caixa de busca (apenas id e título)"""
+    try:
+        suggestions = await db.run_sync(RecipeService.suggest_recipes, q=q, lang=lang, limit=limit)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    return {"suggestions": suggestions}
+
 @router.get("/{recipe_id}", response_model=RecipeResponse)
 async def get_recipe(
     recipe_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Obter uma receita específica"""
-    recipe = RecipeService.get_recipe(db=db, recipe_id=recipe_id)
+    recipe = await db.run_sync(RecipeService.get_recipe, recipe_id=recipe_id)
     if not recipe:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -78,11 +136,11 @@ async def get_recipe(
 async def update_recipe(
     recipe_id: int,
     recipe_update: RecipeUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Atualizar uma receita"""
     # Verificar se a receita existe
-    existing_recipe = RecipeService.get_recipe(db=db, recipe_id=recipe_id)
+    existing_recipe = await db.run_sync(RecipeService.get_recipe, recipe_id=recipe_id)
     if not existing_recipe:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -91,7 +149,7 @@ async def update_recipe(
     
     # Verificar categoria se fornecida
     if recipe_update.category_id:
-        category = CategoryService.get_category(db=db, category_id=recipe_update.category_id)
+        category = await db.run_sync(CategoryService.get_category, category_id=recipe_update.category_id)
         if not category:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -105,8 +163,8 @@ async def update_recipe(
             detail="Dificuldade deve ser entre 1 e 5"
         )
     
-    recipe = RecipeService.update_recipe(
-        db=db, 
+    recipe = await db.run_sync(
+        RecipeService.update_recipe,
         recipe_id=recipe_id, 
         recipe_update=recipe_update
     )
@@ -115,10 +173,10 @@ async def update_recipe(
 @router.delete("/{recipe_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_recipe(
     recipe_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Deletar uma receita"""
-    success = RecipeService.delete_recipe(db=db, recipe_id=recipe_id)
+    success = await db.run_sync(RecipeService.delete_recipe, recipe_id=recipe_id)
     if not success:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -128,15 +186,15 @@ async def delete_recipe(
 @router.get("/category/{category_id}", response_model=List[RecipeResponse])
 async def get_recipes_by_category(
     category_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Obter todas as receitas de uma categoria"""
     # Verificar se a categoria existe
-    category = CategoryService.get_category(db=db, category_id=category_id)
+    category = await db.run_sync(CategoryService.get_category, category_id=category_id)
     if not category:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Categoria não encontrada"
         )
     
-    return RecipeService.get_recipes_by_category(db=db, category_id=category_id)
\ No newline at end of file
+    return await db.run_sync(RecipeService.get_recipes_by_category, category_id=category_id)
\ No newline at end of file
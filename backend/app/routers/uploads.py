@@ -1,12 +1,95 @@
 from fastapi import APIRouter, UploadFile, File, HTTPException, Query
+from fastapi.responses import JSONResponse
 from typing import Optional
 from ..cloudinary_config import CloudinaryService  # ajuste caso necessário
+from ..config import settings
+from ..schemas.image import ImageUrlsRequest
 
 router = APIRouter(
     prefix="/api",
     tags=["Uploads / Images"],
 )
 
+UPLOAD_PATH_PREFIX = "/api/uploads/"
+# Bytes lidos para identificar o formato (magic bytes)
+SNIFF_BYTES = 32
+# Folga para os cabeçalhos do multipart no Content-Length
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+
+def sniff_image_type(header: bytes) -> Optional[str]:
+    """
+    Identifica o tipo real da imagem pelos magic bytes (ignora o content-type do cliente).
+    """
+    if header.startswith(b"\xff\xd8\xff"):
+        return "image/jpeg"
+    if header.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "image/png"
+    if header[:6] in (b"GIF87a", b"GIF89a"):
+        return "image/gif"
+    if header[:4] == b"RIFF" and header[8:12] == b"WEBP":
+        return "image/webp"
+    if header[4:8] == b"ftyp":
+        brand = header[8:12]
+        if brand in (b"heic", b"heix", b"hevc", b"heim", b"heis", b"mif1", b"msf1"):
+            return "image/heic"
+        if brand in (b"avif", b"avis"):
+            return "image/avif"
+    return None
+
+
+def _too_large() -> HTTPException:
+    limit_mb = settings.max_upload_bytes // (1024 * 1024)
+    return HTTPException(status_code=413, detail=f"Arquivo muito grande. Tamanho máximo: {limit_mb} MB.")
+
+
+async def _inspect_upload(file: UploadFile) -> str:
+    """
+    Valida o upload já recebido pelo Starlette (memória até 1 MB, depois disco)
+    sem copiá-lo: tamanho por `file.size` e tipo real pelos primeiros bytes.
+    O corte antecipado de arquivos grandes fica com o UploadSizeLimitMiddleware,
+    que depende do Content-Length.
+    """
+    if file.size is not None and file.size > settings.max_upload_bytes:
+        raise _too_large()
+
+    header = await file.read(SNIFF_BYTES)
+    await file.seek(0)
+    if not header:
+        raise ValueError("Arquivo vazio.")
+
+    content_type = sniff_image_type(header)
+    if content_type is None:
+        raise HTTPException(
+            status_code=415,
+            detail="Formato inválido. Envie uma imagem (JPEG, PNG, WEBP, GIF, HEIC ou AVIF).",
+        )
+    return content_type
+
+
+class UploadSizeLimitMiddleware:
+    """
+    Recusa uploads com Content-Length acima do limite antes de o corpo ser lido
+    (o FastAPI faz o parse do multipart inteiro antes de chamar o endpoint).
+    Sem Content-Length (chunked) o corpo é recebido e só então recusado.
+    ASGI puro: nas demais rotas o custo é só a comparação do path.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"].startswith(UPLOAD_PATH_PREFIX):
+            for name, value in scope["headers"]:
+                if name == b"content-length":
+                    if value.isdigit() and int(value) > settings.max_upload_bytes + MULTIPART_OVERHEAD_BYTES:
+                        response = JSONResponse(status_code=413, content={"detail": _too_large().detail})
+                        await response(scope, receive, send)
+                        return
+                    break
+        await self.app(scope, receive, send)
+
+
 @router.post("/uploads/image")
 async def upload_image(file: UploadFile = File(...)):
     """
@@ -18,15 +101,12 @@ async def upload_image(file: UploadFile = File(...)):
         if not file:
             raise ValueError("Arquivo não enviado (campo 'file').")
 
-        content = await file.read()
-        if not content:
-            raise ValueError("Arquivo vazio.")
+        content_type = await _inspect_upload(file)
 
         filename = (file.filename or "upload").rsplit(".", 1)[0]
-        content_type = file.content_type or "application/octet-stream"
 
-        # Envia para seu serviço do Cloudinary (ajuste a assinatura se for diferente)
-        result = CloudinaryService.upload_image(content, filename, content_type)
+        # Upload no pool dedicado: o event loop continua atendendo as outras rotas
+        result = await CloudinaryService.upload_image_async(file.file, filename, content_type)
 
         if not result or not result.get("success"):
             # expõe o erro real para facilitar depuração
@@ -41,22 +121,54 @@ async def upload_image(file: UploadFile = File(...)):
             "large_url": CloudinaryService.get_large_url(public_id),
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         # Garante que "detail" venha preenchido no 400
         msg = str(e) or "Falha no upload"
         raise HTTPException(status_code=400, detail=msg)
 
 
+# Nomes aceitos para cada variante
+IMAGE_SIZES = {"thumb": "thumbnail", "thumbnail": "thumbnail", "medium": "medium", "large": "large"}
+
+
+def _normalize_size(size: Optional[str]) -> str:
+    """thumb/thumbnail -> thumbnail, large -> large, qualquer outro -> medium."""
+    return IMAGE_SIZES.get((size or "medium").lower(), "medium")
+
+
 @router.get("/images/url")
 def get_image_url(public_id: str = Query(...), size: Optional[str] = Query("medium")):
-    size = (size or "medium").lower()
-    if size in ("thumb", "thumbnail"):
-        url = CloudinaryService.get_thumbnail_url(public_id)
-    elif size == "large":
-        url = CloudinaryService.get_large_url(public_id)
-    else:
-        url = CloudinaryService.get_medium_url(public_id)
+    url = CloudinaryService.get_variant_url(public_id, _normalize_size(size))
 
     if not url:
         raise HTTPException(status_code=400, detail="Não foi possível gerar a URL da imagem.")
     return {"url": url}
+
+
+@router.post("/images/urls")
+def get_image_urls(payload: ImageUrlsRequest):
+    """
+    Resolve vários public_ids em vários tamanhos numa única requisição:
+    {"urls": {public_id: {size: url}}}. Ids vazios são ignorados; sizes aceita
+    thumbnail (ou thumb), medium e large, e a resposta usa os nomes normalizados.
+    """
+    unknown = [size for size in payload.sizes if size.lower() not in IMAGE_SIZES]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Tamanho inválido: {', '.join(unknown)}. Use thumbnail, medium ou large.",
+        )
+
+    sizes = list(dict.fromkeys(_normalize_size(size) for size in payload.sizes))
+    return {
+        "urls": {
+            public_id: {
+                size: CloudinaryService.get_variant_url(public_id, size)
+                for size in sizes
+            }
+            for public_id in dict.fromkeys(payload.public_ids)
+            if public_id
+        }
+    }
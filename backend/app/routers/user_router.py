@@ -1,11 +1,11 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..database import get_db
+from ..database import get_async_db
 from ..schemas.user import UserCreate, UserResponse, UserBase
 from ..models import User
-from ..security import get_password_hash
-from ..auth_deps import get_current_user
+from ..security import PasswordHashPoolBusy, hash_password
+from ..auth_deps import CurrentUser, get_current_user
 from ..services.user_service import get_user_by_email, create_user as create_user_service
 
 router = APIRouter(
@@ -13,21 +13,33 @@ router = APIRouter(
     tags=["Users"]
 )
 
+async def _hash_or_503(password: str) -> str:
+    try:
+        return await hash_password(password)
+    except PasswordHashPoolBusy as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "1"},
+        )
+
 @router.post("/", response_model=UserResponse)
-async def create_user(user: UserCreate, db: Session = Depends(get_db)):
-    db_user = get_user_by_email(db, email=user.email)
+async def create_user(user: UserCreate, db: AsyncSession = Depends(get_async_db)):
+    db_user = await db.run_sync(get_user_by_email, email=user.email)
     if db_user:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email já registrado")
-    return create_user_service(db=db, user=user, is_admin=False)
+    hashed_password = await _hash_or_503(user.password)
+    return await db.run_sync(create_user_service, user=user, is_admin=False, hashed_password=hashed_password)
 
 @router.post("/admin", response_model=UserResponse)
-async def create_admin_user(user: UserCreate, db: Session = Depends(get_db)):
-    db_user = get_user_by_email(db, email=user.email)
+async def create_admin_user(user: UserCreate, db: AsyncSession = Depends(get_async_db)):
+    db_user = await db.run_sync(get_user_by_email, email=user.email)
     if db_user:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email já registrado")
-    return create_user_service(db=db, user=user, is_admin=True)
+    hashed_password = await _hash_or_503(user.password)
+    return await db.run_sync(create_user_service, user=user, is_admin=True, hashed_password=hashed_password)
 
 @router.get("/me", response_model=UserResponse)
-async def read_users_me(current_user: User = Depends(get_current_user)):
+async def read_users_me(current_user: CurrentUser = Depends(get_current_user)):
     return current_user
 
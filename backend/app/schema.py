@@ -0,0 +1,38 @@
+"""
+Verificação da versão do schema na inicialização.
+
+O schema é criado e alterado pelas migrações do Alembic (backend/migrations,
+`alembic upgrade head`); a API só confere se o banco está na revisão mais
+recente conhecida pelo código, sem executar DDL.
+"""
+from pathlib import Path
+from typing import Optional
+
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+
+ALEMBIC_INI = Path(__file__).resolve().parent.parent / "alembic.ini"
+
+class SchemaVersionError(RuntimeError):
+    """Banco sem as migrações aplicadas (ou mais novo que o código)."""
+
+def expected_revision() -> Optional[str]:
+    """Revisão head das migrações deste código."""
+    config = Config(str(ALEMBIC_INI))
+    config.set_main_option("script_location", str(ALEMBIC_INI.parent / "migrations"))
+    return ScriptDirectory.from_config(config).get_current_head()
+
+def current_revision(connection) -> Optional[str]:
+    """Revisão registrada no banco (tabela alembic_version)."""
+    return MigrationContext.configure(connection).get_current_revision()
+
+def check_schema_version(connection) -> str:
+    """Retorna a revisão do banco; lança SchemaVersionError se não for a head."""
+    current, expected = current_revision(connection), expected_revision()
+    if current != expected:
+        raise SchemaVersionError(
+            f"Schema do banco na revisão {current or 'nenhuma'}, esperada {expected}. "
+            "Rode `alembic upgrade head`."
+        )
+    return current
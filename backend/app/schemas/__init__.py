@@ -1,9 +1,11 @@
 from .category import CategoryCreate, CategoryResponse
 from .recipe import RecipeCreate, RecipeUpdate, RecipeResponse
 from .user import UserCreate, UserResponse
+from .image import ImageUrlsRequest
 
 __all__ = [
     "CategoryCreate", "CategoryResponse",
     "RecipeCreate", "RecipeUpdate", "RecipeResponse", 
-    "UserCreate", "UserResponse"
+    "UserCreate", "UserResponse",
+    "ImageUrlsRequest"
 ]
\ No newline at end of file
@@ -0,0 +1,6 @@
+from pydantic import BaseModel, Field
+from typing import List
+
+class ImageUrlsRequest(BaseModel):
+    public_ids: List[str] = Field(..., max_length=500)
+    sizes: List[str] = Field(["thumbnail", "medium", "large"], max_length=3)
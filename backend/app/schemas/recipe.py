@@ -1,5 +1,5 @@
 from pydantic import BaseModel, HttpUrl
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
 class RecipeBase(BaseModel):
@@ -34,4 +34,7 @@ class RecipeResponse(RecipeBase):
     created_at: datetime
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class RecipeBulkDelete(BaseModel):
+    ids: List[int]
\ No newline at end of file
@@ -0,0 +1,110 @@
+"""
+Busca textual das receitas (Postgres full-text search e pg_trgm).
+
+Cada idioma tem uma configuração própria (shapeme_pt/en/es) copiada da
+configuração nativa do Postgres, com o dicionário `unaccent` antes do stemmer,
+para que "acai" encontre "açaí" (criadas pela migração 0001; os índices, pela
+0003). Os índices GIN são de expressão: as queries precisam montar exatamente a mesma expressão
+(search_vector) para usá-los.
+
+As sugestões (typeahead) usam índices GiST de trigramas nos títulos sem
+acentos (shapeme_unaccent, criada pela migração 0004), que toleram erros de
+digitação e prefixos incompletos e devolvem os mais parecidos primeiro (KNN).
+"""
+from typing import Optional
+from sqlalchemy import Index, func, literal, literal_column, or_, select
+from .models import Recipe
+
+# idioma da API -> configuração nativa do Postgres
+LANGUAGES = {
+    "pt": "portuguese",
+    "en": "english",
+    "es": "spanish",
+}
+
+def resolve_lang(lang: Optional[str]) -> Optional[str]:
+    """Normaliza o parâmetro lang ("pt", "pt-BR", "EN"...). Lança ValueError se não suportado."""
+    if not lang:
+        return None
+    code = lang.strip().lower()[:2]
+    if code not in LANGUAGES:
+        raise ValueError("Idioma inválido. Use pt, en ou es")
+    return code
+
+def search_vector(lang: str):
+    """tsvector do idioma: título com peso A, descrição com peso B."""
+    # Literais (e não bind params) para a expressão casar com a do índice
+    config = literal_column(f"'shapeme_{lang}'::regconfig")
+    title = getattr(Recipe, f"title_{lang}")
+    description = getattr(Recipe, f"description_{lang}")
+    return func.setweight(func.to_tsvector(config, title), literal_column("'A'")).op("||")(
+        func.setweight(func.to_tsvector(config, description), literal_column("'B'"))
+    )
+
+def _search_query(term: str, lang: str):
+    return func.websearch_to_tsquery(literal_column(f"'shapeme_{lang}'::regconfig"), term)
+
+def _languages(lang: Optional[str]):
+    return [lang] if lang else list(LANGUAGES)
+
+def search_filter(term: str, lang: Optional[str] = None):
+    """Condição WHERE da busca; sem idioma, procura nos três."""
+    return or_(*[
+        search_vector(code).op("@@")(_search_query(term, code))
+        for code in _languages(lang)
+    ])
+
+def search_rank(term: str, lang: Optional[str] = None):
+    """Relevância da busca (maior rank entre os idiomas pesquisados)."""
+    ranks = [
+        func.ts_rank(search_vector(code), _search_query(term, code))
+        for code in _languages(lang)
+    ]
+    return ranks[0] if len(ranks) == 1 else func.greatest(*ranks)
+
+# Índices GIN de expressão, um por idioma. Só com expressões o Index não se
+# associa sozinho à tabela: sem o append_constraint o autogenerate do Alembic
+# não o encontraria no metadata e proporia removê-lo do banco.
+SEARCH_INDEXES = [
+    Index(f"ix_recipes_search_{code}", search_vector(code), postgresql_using="gin")
+    for code in LANGUAGES
+]
+for _index in SEARCH_INDEXES:
+    Recipe.__table__.append_constraint(_index)
+
+def unaccented(expression):
+    """unaccent imutável (pode ser indexado); mesma expressão dos índices de sugestão."""
+    return func.shapeme_unaccent(expression)
+
+# Índices de trigramas nos títulos sem acentos (sugestões). GiST e não GIN: o
+# GiST entrega as linhas já na ordem de similaridade (ORDER BY <<-> ... LIMIT),
+# sem ler e ordenar todas as que casam. siglen maior deixa a assinatura menos
+# ambígua com títulos que compartilham muitos trigramas.
+TRIGRAM_INDEXES = [
+    Index(
+        f"ix_recipes_title_{code}_suggest",
+        unaccented(getattr(Recipe, f"title_{code}")).label(f"title_{code}_unaccent"),
+        postgresql_using="gist",
+        postgresql_ops={f"title_{code}_unaccent": "gist_trgm_ops(siglen=256)"},
+    )
+    for code in LANGUAGES
+]
+for _index in TRIGRAM_INDEXES:
+    Recipe.__table__.append_constraint(_index)
+
+def suggest_query(term: str, lang: str = "pt", limit: int = 8):
+    """
+    Sugestões de títulos por similaridade de palavras (operador <% do pg_trgm),
+    sem diferenciar acentos, retornando apenas id e título. Usa o índice de
+    trigramas do idioma também para a ordem (distância <<->).
+    """
+    title = getattr(Recipe, f"title_{lang}")
+    query, target = unaccented(literal(term)), unaccented(title)
+    # Sem desempate por id: empates (muito comuns em títulos parecidos) obrigariam
+    # o Postgres a ler e ordenar todos os empatados em vez de parar no limit
+    return (
+        select(Recipe.id, title.label("title"))
+        .where(query.op("<%")(target))
+        .order_by(query.op("<<->")(target))
+        .limit(limit)
+    )
@@ -1,15 +1,27 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import Optional, Tuple
 
 from passlib.context import CryptContext
 from jose import JWTError, jwt
 
 from .config import settings
+from .metrics import PASSWORD_HASH_LATENCY
 
-# Configuração de hash de senha
-pwd_context = CryptContext(schemes=["bcrypt_sha256"], deprecated="auto")
+# Configuração de hash de senha.
+# min/max iguais ao custo configurado: hashes com outro custo são refeitos no login.
+pwd_context = CryptContext(
+    schemes=["bcrypt_sha256"],
+    deprecated="auto",
+    bcrypt_sha256__default_rounds=settings.bcrypt_rounds,
+    bcrypt_sha256__min_rounds=settings.bcrypt_rounds,
+    bcrypt_sha256__max_rounds=settings.bcrypt_rounds,
+)
 
-# Funções de hash
+# Funções de hash (síncronas: scripts e código fora do event loop)
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verifica se a senha em texto plano corresponde à senha hasheada."""
     return pwd_context.verify(plain_password, hashed_password)
@@ -18,6 +30,81 @@ def get_password_hash(password: str) -> str:
     """Retorna o hash de uma senha em texto plano."""
     return pwd_context.hash(password)
 
+class PasswordHashPoolBusy(Exception):
+    """Fila do pool de hash cheia: a requisição deve ser recusada (503)."""
+
+class PasswordHashPool:
+    """
+    Pool de threads dedicado ao bcrypt (que libera o GIL), para que hash e
+    verificação não travem o event loop. O número de workers limita a
+    concorrência e a fila é limitada: acima dela as chamadas são recusadas.
+    """
+
+    def __init__(self, workers: int, max_queue: int):
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash")
+        self._lock = threading.Lock()
+        self.pending = 0      # submetidas e ainda não concluídas
+        self.running = 0      # em execução nos workers
+        self.completed = 0
+        self.rejected = 0
+        self.busy_seconds = 0.0
+
+    def _run(self, fn, *args):
+        with self._lock:
+            self.running += 1
+        started = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            elapsed = time.perf_counter() - started
+            PASSWORD_HASH_LATENCY.labels(getattr(fn, "__name__", "unknown")).observe(elapsed)
+            with self._lock:
+                self.running -= 1
+                self.pending -= 1
+                self.completed += 1
+                self.busy_seconds += elapsed
+
+    async def submit(self, fn, *args):
+        with self._lock:
+            if self.pending - self.running >= self.max_queue:
+                self.rejected += 1
+                raise PasswordHashPoolBusy("Muitas requisições de autenticação simultâneas")
+            self.pending += 1
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._run, fn, *args)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "running": self.running,
+                "queued": self.pending - self.running,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "avg_seconds": round(self.busy_seconds / self.completed, 4) if self.completed else 0.0,
+                "bcrypt_rounds": settings.bcrypt_rounds,
+            }
+
+password_hash_pool = PasswordHashPool(
+    workers=settings.password_hash_workers,
+    max_queue=settings.password_hash_max_queue,
+)
+
+# Funções de hash assíncronas (handlers async def)
+async def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verifica a senha no pool dedicado. Retorna (válida, novo_hash); novo_hash vem
+    preenchido quando o hash salvo usa um custo diferente do configurado.
+    """
+    return await password_hash_pool.submit(pwd_context.verify_and_update, plain_password, hashed_password)
+
+async def hash_password(password: str) -> str:
+    """Gera o hash de uma senha no pool dedicado."""
+    return await password_hash_pool.submit(pwd_context.hash, password)
+
 # Funções de JWT
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Cria um token de acesso JWT."""
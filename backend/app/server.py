@@ -0,0 +1,160 @@
+"""
+Servidor de produção: Gunicorn gerenciando workers Uvicorn.
+
+    python -m app.server
+
+- Workers: WEB_CONCURRENCY ou, por padrão, um por núcleo disponível para o
+  container (afinidade de CPU e cota do cgroup), já que cada worker é um
+  event loop.
+- uvloop/httptools quando instalados (uvicorn[standard]), senão asyncio/h11.
+- preload: a aplicação e os models são importados no master antes do fork
+  (workers sobem mais rápido e compartilham a memória das páginas importadas).
+- Restart gradual: `kill -HUP <master>` troca os workers um a um, sem derrubar
+  conexões; MAX_REQUESTS recicla cada worker periodicamente. Com preload o HUP
+  não recarrega código: para um deploy, reinicie o container.
+- Warmup por worker: no startup de cada worker (ver main.startup_event) o pool
+  abre conexões e o cache de categorias é carregado antes do primeiro request.
+- Métricas: com PROMETHEUS_MULTIPROC_DIR (definido no Dockerfile) cada worker
+  grava seus contadores nesse diretório e o /metrics agrega todos; o CMD do
+  Dockerfile o recria vazio a cada início do container.
+- Caches em memória (cache.py) são por worker: uma escrita invalida só o cache
+  do worker que a atendeu, e os demais servem dados antigos até o TTL
+  (CATEGORY_CACHE_TTL_SECONDS, USER_CACHE_TTL_SECONDS) expirar.
+"""
+import importlib.util
+import math
+import os
+from pathlib import Path
+from typing import Optional
+
+from gunicorn.app.base import BaseApplication
+from prometheus_client import multiprocess
+from uvicorn.workers import UvicornWorker
+
+from .config import settings
+from .metrics import multiprocess_enabled
+
+
+def _cgroup_cpu_limit() -> Optional[float]:
+    """Cota de CPU do container (cgroup v2 ou v1), se houver."""
+    try:
+        quota, period = Path("/sys/fs/cgroup/cpu.max").read_text().split()[:2]
+        if quota != "max":
+            return int(quota) / int(period)
+    except (OSError, ValueError):
+        pass
+    try:
+        quota = int(Path("/sys/fs/cgroup/cpu/cpu.cfs_quota_us").read_text())
+        period = int(Path("/sys/fs/cgroup/cpu/cpu.cfs_period_us").read_text())
+        if quota > 0 and period > 0:
+            return quota / period
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def available_cpus() -> int:
+    """Núcleos que este processo pode usar (o menor entre afinidade e cota)."""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    limit = _cgroup_cpu_limit()
+    if limit is not None:
+        cpus = min(cpus, max(1, math.ceil(limit)))
+    return max(1, cpus)
+
+
+def worker_count() -> int:
+    if settings.web_concurrency > 0:
+        return settings.web_concurrency
+    return available_cpus()
+
+
+def _installed(module: str) -> bool:
+    return importlib.util.find_spec(module) is not None
+
+
+class ShapeMeUvicornWorker(UvicornWorker):
+    """Worker Uvicorn com uvloop/httptools quando disponíveis."""
+    CONFIG_KWARGS = {
+        "loop": "uvloop" if _installed("uvloop") else "asyncio",
+        "http": "httptools" if _installed("httptools") else "h11",
+        "lifespan": "on",
+        # Atrás do nginx: usa X-Forwarded-* para o IP/protocolo do cliente
+        "proxy_headers": True,
+        "forwarded_allow_ips": "*",
+    }
+
+
+def post_fork(server, worker) -> None:
+    """
+    Conexões abertas no master (preload) não podem ser compartilhadas com os
+    workers: cada worker começa com pools vazios.
+    """
+    from .database import async_engine, engine
+    from .replicas import replica_set
+
+    engine.dispose(close=False)
+    for pooled in [async_engine, *replica_set.engines]:
+        pooled.sync_engine.dispose(close=False)
+
+
+def child_exit(server, worker) -> None:
+    """Worker encerrado: os valores dele continuam somados, mas saem dos gauges 'live'."""
+    if multiprocess_enabled():
+        multiprocess.mark_process_dead(worker.pid)
+
+
+def when_ready(server) -> None:
+    loop = ShapeMeUvicornWorker.CONFIG_KWARGS["loop"]
+    http = ShapeMeUvicornWorker.CONFIG_KWARGS["http"]
+    server.log.info(
+        "ShapeMe API: %s workers (%s núcleos disponíveis), loop=%s, http=%s",
+        server.cfg.workers, available_cpus(), loop, http,
+    )
+
+
+def gunicorn_options() -> dict:
+    return {
+        "bind": f"{settings.server_host}:{settings.server_port}",
+        "workers": worker_count(),
+        # Caminho importável (o Gunicorn não aceita a classe diretamente)
+        "worker_class": "app.server.ShapeMeUvicornWorker",
+        "preload_app": settings.server_preload,
+        "timeout": settings.server_timeout,
+        "graceful_timeout": settings.server_graceful_timeout,
+        "keepalive": settings.server_keepalive,
+        "max_requests": settings.server_max_requests,
+        "max_requests_jitter": settings.server_max_requests_jitter,
+        "post_fork": post_fork,
+        "child_exit": child_exit,
+        "when_ready": when_ready,
+        "accesslog": "-",
+        "errorlog": "-",
+    }
+
+
+class ShapeMeServer(BaseApplication):
+    """Gunicorn configurado por código (sem gunicorn.conf.py)."""
+
+    def __init__(self, options: dict):
+        self.options = options
+        super().__init__()
+
+    def load_config(self):
+        for key, value in self.options.items():
+            self.cfg.set(key, value)
+
+    def load(self):
+        from .main import app
+
+        return app
+
+
+def main() -> None:
+    ShapeMeServer(gunicorn_options()).run()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,7 @@
 from .category_service import CategoryService
 from .recipe_service import RecipeService
+from .stats_service import StatsService
+from .maintenance_service import MaintenanceService
 
 
-__all__ = ["CategoryService", "RecipeService"]
\ No newline at end of file
+__all__ = ["CategoryService", "RecipeService", "StatsService", "MaintenanceService"]
\ No newline at end of file
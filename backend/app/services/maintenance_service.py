@@ -0,0 +1,56 @@
+from sqlalchemy import delete
+from sqlalchemy.orm import Session
+from typing import List
+from ..models import Category, Recipe
+from .recipe_import import INT32_MAX
+
+# Limite de ids por requisição de exclusão em lote (parâmetros do IN)
+MAX_BULK_DELETE_IDS = 1000
+
+class MaintenanceService:
+    """
+    Operações de manutenção em lote: um DELETE por tabela, numa única transação,
+    retornando quantas linhas foram afetadas.
+    """
+    
+    @staticmethod
+    def delete_recipes(db: Session, recipe_ids: List[int]) -> int:
+        """Lança ValueError se a lista for grande demais ou tiver ids fora da faixa da coluna."""
+        if len(recipe_ids) > MAX_BULK_DELETE_IDS:
+            raise ValueError(f"Envie no máximo {MAX_BULK_DELETE_IDS} ids por requisição")
+        if any(not 1 <= recipe_id <= INT32_MAX for recipe_id in recipe_ids):
+            raise ValueError("Ids de receita inválidos")
+        if not recipe_ids:
+            return 0
+        try:
+            result = db.execute(delete(Recipe).where(Recipe.id.in_(set(recipe_ids))))
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        return result.rowcount
+    
+    @staticmethod
+    def delete_recipes_by_category(db: Session, category_id: int) -> int:
+        try:
+            result = db.execute(delete(Recipe).where(Recipe.category_id == category_id))
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        return result.rowcount
+    
+    @staticmethod
+    def reset_catalog(db: Session) -> dict:
+        """Apaga todas as receitas e categorias (receitas primeiro, por causa da foreign key)."""
+        try:
+            recipes = db.execute(delete(Recipe))
+            categories = db.execute(delete(Category))
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        return {
+            "recipes_deleted": recipes.rowcount,
+            "categories_deleted": categories.rowcount
+        }
@@ -0,0 +1,69 @@
+"""
+Exportação do catálogo de receitas (NDJSON ou CSV) em streaming.
+
+As linhas vêm de um cursor no servidor (yield_per) e são escritas em blocos,
+então a memória não cresce com o tamanho do catálogo.
+"""
+import csv
+import io
+import json
+from typing import AsyncIterator, Optional
+
+from sqlalchemy import select
+
+from ..database import AsyncSessionLocal
+from ..models import Recipe
+
+EXPORT_BATCH_SIZE = 500
+FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+EXPORT_COLUMNS = [
+    "id",
+    "title_pt", "title_en", "title_es",
+    "description_pt", "description_en", "description_es",
+    "image_url", "difficulty", "prep_time_minutes", "category_id",
+    "created_at", "updated_at",
+]
+
+
+def _export_query(category_id: Optional[int] = None):
+    query = select(*[getattr(Recipe, column) for column in EXPORT_COLUMNS]).order_by(Recipe.id)
+    if category_id:
+        query = query.filter(Recipe.category_id == category_id)
+    return query
+
+
+def _row_values(row) -> list:
+    return [value.isoformat() if hasattr(value, "isoformat") else value for value in row]
+
+
+async def stream_recipes(fmt: str, category_id: Optional[int] = None) -> AsyncIterator[bytes]:
+    """
+    Gera o arquivo em blocos de EXPORT_BATCH_SIZE linhas. Usa uma sessão própria,
+    que vive enquanto a resposta estiver sendo enviada.
+    """
+    async with AsyncSessionLocal() as db:
+        result = await db.stream(
+            _export_query(category_id).execution_options(yield_per=EXPORT_BATCH_SIZE)
+        )
+
+        if fmt == "csv":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(EXPORT_COLUMNS)
+            async for rows in result.partitions():
+                writer.writerows(_row_values(row) for row in rows)
+                yield buffer.getvalue().encode("utf-8")
+                buffer.seek(0)
+                buffer.truncate()
+            if buffer.tell():
+                yield buffer.getvalue().encode("utf-8")
+        else:
+            async for rows in result.partitions():
+                yield "".join(
+                    json.dumps(dict(zip(EXPORT_COLUMNS, _row_values(row))), ensure_ascii=False) + "\n"
+                    for row in rows
+                ).encode("utf-8")
@@ -0,0 +1,125 @@
+"""
+Importação em lote de receitas (NDJSON ou CSV).
+
+O corpo é lido em blocos para um arquivo temporário e percorrido duas vezes:
+a primeira coleta os category_id (validados com uma única query) e a segunda
+valida cada linha e insere em lotes. A memória fica constante, qualquer que
+seja o tamanho do arquivo. As duas passadas são CPU-bound e rodam no
+threadpool (a segunda, um lote por vez), fora do event loop.
+"""
+import csv
+import io
+import json
+from typing import BinaryIO, Iterator, List, Optional, Tuple
+
+from pydantic import ValidationError
+
+from ..schemas.recipe import RecipeCreate
+
+IMPORT_BATCH_SIZE = 1000
+FORMATS = ("ndjson", "csv")
+# Faixa das colunas INTEGER do Postgres
+INT32_MIN, INT32_MAX = -2**31, 2**31 - 1
+
+
+def detect_format(content_type: Optional[str], requested: Optional[str] = None) -> str:
+    """Formato pelo parâmetro ?format= ou pelo Content-Type (padrão: ndjson)."""
+    if requested:
+        fmt = requested.lower()
+        if fmt not in FORMATS:
+            raise ValueError("Formato inválido. Use ndjson ou csv")
+        return fmt
+    if content_type and "csv" in content_type.lower():
+        return "csv"
+    return "ndjson"
+
+
+def iter_rows(source: BinaryIO, fmt: str) -> Iterator[Tuple[int, object]]:
+    """
+    Percorre o arquivo retornando (número_da_linha, dados). Linhas que não
+    puderam ser lidas vêm com uma exceção no lugar dos dados. Lança ValueError
+    se o arquivo não estiver em UTF-8.
+    """
+    source.seek(0)
+    text = io.TextIOWrapper(source, encoding="utf-8-sig", newline="")
+    try:
+        if fmt == "csv":
+            for number, row in enumerate(csv.DictReader(text), start=1):
+                yield number, row
+        else:
+            for number, line in enumerate(text, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    yield number, json.loads(line)
+                except ValueError as e:
+                    yield number, ValueError(f"JSON inválido: {e}")
+    except UnicodeDecodeError:
+        raise ValueError("Arquivo inválido: use UTF-8")
+    finally:
+        # Não fecha o arquivo de origem junto com o wrapper
+        text.detach()
+
+
+def validate_row(data: object) -> dict:
+    """Valida uma linha com as mesmas regras do POST /api/recipes. Lança ValueError."""
+    if isinstance(data, Exception):
+        raise data
+    if not isinstance(data, dict):
+        raise ValueError("Cada linha deve ser um objeto")
+
+    # Células vazias do CSV contam como ausentes
+    data = {key: value for key, value in data.items() if key and value not in ("", None)}
+    try:
+        recipe = RecipeCreate(**data)
+    except ValidationError as e:
+        fields = ", ".join(".".join(str(part) for part in error["loc"]) for error in e.errors())
+        raise ValueError(f"Campos inválidos ou ausentes: {fields}")
+
+    if recipe.difficulty < 1 or recipe.difficulty > 5:
+        raise ValueError("Dificuldade deve ser entre 1 e 5")
+    if not INT32_MIN <= recipe.prep_time_minutes <= INT32_MAX:
+        raise ValueError("Tempo de preparo inválido")
+
+    values = recipe.dict()
+    values["image_url"] = values.get("image_url") or ""
+    return values
+
+
+def collect_category_ids(source: BinaryIO, fmt: str) -> set:
+    """
+    Primeira passada: category_id referenciados (para validar com uma query).
+    Ids fora da faixa de INTEGER ficam de fora (a linha falha como categoria
+    não encontrada). Lança ValueError se o arquivo não estiver em UTF-8.
+    """
+    ids = set()
+    for _, data in iter_rows(source, fmt):
+        if isinstance(data, dict):
+            try:
+                category_id = int(data.get("category_id"))
+            except (TypeError, ValueError):
+                continue
+            if INT32_MIN <= category_id <= INT32_MAX:
+                ids.add(category_id)
+    return ids
+
+
+def read_batch(rows: Iterator[Tuple[int, object]], existing: set, errors: List[dict]) -> List[dict]:
+    """
+    Segunda passada: valida linhas até completar um lote (ou o arquivo acabar).
+    Linhas inválidas vão para `errors`; lote vazio significa fim do arquivo.
+    """
+    batch = []
+    for row_number, data in rows:
+        try:
+            values = validate_row(data)
+            if values["category_id"] not in existing:
+                raise ValueError("Categoria não encontrada")
+        except ValueError as e:
+            errors.append({"row": row_number, "error": str(e)})
+            continue
+        
+        batch.append(values)
+        if len(batch) >= IMPORT_BATCH_SIZE:
+            break
+    return batch
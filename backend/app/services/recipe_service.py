@@ -1,7 +1,97 @@
+import base64
+from datetime import datetime
+from sqlalchemy import select, tuple_
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from sqlalchemy.sql import Select
+from typing import List, Optional, Sequence, Tuple
 from ..models import Recipe
 from ..schemas.recipe import RecipeCreate, RecipeUpdate
+from ..search import LANGUAGES, resolve_lang, search_filter, search_rank, suggest_query
+
+# Colunas das listagens: selecionadas como tuplas (Row), sem montar objetos ORM
+LIST_COLUMNS = (
+    Recipe.id,
+    Recipe.title_pt,
+    Recipe.title_en,
+    Recipe.title_es,
+    Recipe.description_pt,
+    Recipe.description_en,
+    Recipe.description_es,
+    Recipe.image_url,
+    Recipe.difficulty,
+    Recipe.prep_time_minutes,
+    Recipe.category_id,
+    Recipe.created_at,
+    Recipe.updated_at,
+)
+
+# Campos aceitos em ?fields=, na ordem da resposta. title/description viram
+# title_pt, title_en... (só o idioma de ?lang= quando informado) e as URLs das
+# variantes são montadas a partir de image_url.
+RECIPE_FIELDS = (
+    "id",
+    "title",
+    "description",
+    "image_url",
+    "difficulty",
+    "prep_time_minutes",
+    "category_id",
+    "created_at",
+    "thumbnail_url",
+    "medium_url",
+    "large_url",
+)
+LOCALIZED_FIELDS = ("title", "description")
+IMAGE_URL_FIELDS = ("thumbnail_url", "medium_url", "large_url")
+# Sempre selecionadas: id (resposta), created_at (cursor) e updated_at (ETag)
+_REQUIRED_COLUMNS = ("id", "created_at", "updated_at")
+
+def resolve_fields(fields: Optional[str] = None, lang: Optional[str] = None) -> List[str]:
+    """
+    Chaves de cada receita na resposta para ?fields= e ?lang= (id sempre incluído).
+    Lança ValueError para campo ou idioma inválido.
+    """
+    lang = resolve_lang(lang)
+    if fields:
+        requested = {name.strip().lower() for name in fields.split(",") if name.strip()}
+        unknown = sorted(requested - set(RECIPE_FIELDS))
+        if unknown:
+            raise ValueError(f"Campos inválidos: {', '.join(unknown)}. Use: {', '.join(RECIPE_FIELDS)}")
+        requested.add("id")
+    else:
+        requested = set(RECIPE_FIELDS)
+    
+    languages = [lang] if lang else list(LANGUAGES)
+    keys = []
+    for name in RECIPE_FIELDS:
+        if name not in requested:
+            continue
+        if name in LOCALIZED_FIELDS:
+            keys.extend(f"{name}_{code}" for code in languages)
+        else:
+            keys.append(name)
+    return keys
+
+def projection_columns(keys: Sequence[str]) -> tuple:
+    """Colunas de LIST_COLUMNS necessárias para montar as chaves (projeção no SELECT)."""
+    names = set(keys) | set(_REQUIRED_COLUMNS)
+    if names & set(IMAGE_URL_FIELDS):
+        names.add("image_url")
+    return tuple(column for column in LIST_COLUMNS if column.key in names)
+
+def encode_cursor(recipe: Recipe) -> str:
+    """Gera o cursor opaco (created_at, id) da última receita de uma página."""
+    raw = f"{recipe.created_at.isoformat()}|{recipe.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Decodifica um cursor gerado por encode_cursor. Lança ValueError se inválido."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, recipe_id = base64.urlsafe_b64decode(padded).decode().split("|")
+        return datetime.fromisoformat(created_at), int(recipe_id)
+    except Exception:
+        raise ValueError("Cursor inválido")
 
 class RecipeService:
     @staticmethod
@@ -17,27 +107,100 @@ class RecipeService:
         return db.query(Recipe).filter(Recipe.id == recipe_id).first()
     
     @staticmethod
-    def get_recipes(
-        db: Session, 
-        skip: int = 0, 
-        limit: int = 100,
+    def apply_filters(
+        query,
         category_id: Optional[int] = None,
-        search: Optional[str] = None
-    ) -> List[Recipe]:
-        query = db.query(Recipe)
+        search: Optional[str] = None,
+        lang: Optional[str] = None
+    ):
+        """Aplica os filtros de categoria e busca full-text (serve para Query e Select)."""
+        lang = resolve_lang(lang)
         
         if category_id:
             query = query.filter(Recipe.category_id == category_id)
         
         if search:
-            search_filter = f"%{search}%"
+            query = query.filter(search_filter(search, lang))
+        
+        return query
+    
+    @staticmethod
+    def order_by_relevance(query, search: Optional[str] = None, lang: Optional[str] = None):
+        """Ordena por relevância quando há busca (id como desempate estável)."""
+        lang = resolve_lang(lang)
+        
+        if search:
+            query = query.order_by(search_rank(search, lang).desc(), Recipe.id)
+        return query
+    
+    @staticmethod
+    def get_recipes(
+        db: Session,
+        skip: int = 0,
+        limit: int = 100,
+        category_id: Optional[int] = None,
+        search: Optional[str] = None,
+        lang: Optional[str] = None
+    ) -> List[Recipe]:
+        query = RecipeService.apply_filters(db.query(Recipe), category_id, search, lang)
+        query = RecipeService.order_by_relevance(query, search, lang)
+        return query.offset(skip).limit(limit).all()
+    
+    @staticmethod
+    def keyset_query(
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        category_id: Optional[int] = None,
+        search: Optional[str] = None,
+        lang: Optional[str] = None,
+        columns: Optional[Sequence] = None
+    ) -> Select:
+        """
+        Select paginado por cursor, ordenado por (created_at, id) decrescente.
+        A busca aqui só filtra (a ordem do cursor não pode depender do rank).
+        Busca limit + 1 linhas para saber se existe próxima página.
+        Com `columns` (ex.: LIST_COLUMNS) retorna linhas em vez de objetos Recipe.
+        """
+        query = RecipeService.apply_filters(select(*(columns or (Recipe,))), category_id, search, lang)
+        
+        if cursor:
+            created_at, recipe_id = decode_cursor(cursor)
             query = query.filter(
-                Recipe.title_pt.ilike(search_filter) |
-                Recipe.title_en.ilike(search_filter) |
-                Recipe.title_es.ilike(search_filter)
+                tuple_(Recipe.created_at, Recipe.id) < tuple_(created_at, recipe_id)
             )
         
-        return query.offset(skip).limit(limit).all()
+        return query.order_by(Recipe.created_at.desc(), Recipe.id.desc()).limit(max(limit, 0) + 1)
+    
+    @staticmethod
+    def split_page(recipes: List[Recipe], limit: int) -> Tuple[List[Recipe], Optional[str]]:
+        """Separa a página do excedente e calcula o next_cursor."""
+        if limit < 1:
+            return [], None
+        if len(recipes) > limit:
+            page = recipes[:limit]
+            return page, encode_cursor(page[-1])
+        return recipes, None
+    
+    @staticmethod
+    def get_recipes_page(
+        db: Session,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        category_id: Optional[int] = None,
+        search: Optional[str] = None,
+        lang: Optional[str] = None
+    ) -> Tuple[List[Recipe], Optional[str]]:
+        query = RecipeService.keyset_query(cursor, limit, category_id, search, lang)
+        recipes = db.execute(query).scalars().all()
+        return RecipeService.split_page(list(recipes), limit)
+    
+    @staticmethod
+    def suggest_recipes(db: Session, q: str, lang: Optional[str] = None, limit: int = 8) -> List[dict]:
+        term = (q or "").strip()
+        if len(term) < 2:
+            return []
+        rows = db.execute(suggest_query(term, resolve_lang(lang) or "pt", limit)).all()
+        return [{"id": row.id, "title": row.title} for row in rows]
     
     @staticmethod
     def update_recipe(db: Session, recipe_id: int, recipe_update: RecipeUpdate) -> Optional[Recipe]:
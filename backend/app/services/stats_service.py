@@ -0,0 +1,69 @@
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.orm import Session
+from ..models import Category, Recipe
+
+class StatsService:
+    @staticmethod
+    def get_stats(db: Session) -> dict:
+        """
+        Contagens do dashboard: total, por categoria e por dificuldade.
+        As contagens saem de um único GROUP BY GROUPING SETS sobre recipes
+        (uma linha por categoria/dificuldade), sem carregar nenhuma receita.
+        """
+        categories = db.execute(
+            select(Category.id, Category.name_pt, Category.name_en, Category.name_es)
+            .order_by(Category.id)
+        ).all()
+        
+        # GROUPING(col) = 1 quando col não faz parte do agrupamento da linha:
+        # só GROUPING(difficulty) -> linha por categoria; só GROUPING(category_id)
+        # -> linha por dificuldade; os dois -> total geral.
+        rows = db.execute(
+            select(
+                Recipe.category_id,
+                Recipe.difficulty,
+                func.grouping(Recipe.category_id).label("by_difficulty"),
+                func.grouping(Recipe.difficulty).label("by_category"),
+                func.count(Recipe.id).label("recipes_count"),
+            ).group_by(
+                func.grouping_sets(
+                    tuple_(Recipe.category_id),
+                    tuple_(Recipe.difficulty),
+                    tuple_(),
+                )
+            )
+        ).all()
+        
+        total_recipes = 0
+        by_category = {}
+        by_difficulty = {}
+        for row in rows:
+            if row.by_difficulty and row.by_category:
+                total_recipes = row.recipes_count
+            elif row.by_category:
+                by_category[row.category_id] = row.recipes_count
+            else:
+                by_difficulty[row.difficulty] = row.recipes_count
+        
+        return {
+            "total_categories": len(categories),
+            "total_recipes": total_recipes,
+            "category_stats": [
+                {
+                    "category": {
+                        "id": category.id,
+                        "name_pt": category.name_pt,
+                        "name_en": category.name_en,
+                        "name_es": category.name_es
+                    },
+                    "recipes_count": by_category.get(category.id, 0)
+                }
+                for category in categories
+            ],
+            "difficulty_stats": [
+                {"difficulty": difficulty, "recipes_count": count}
+                for difficulty, count in sorted(
+                    by_difficulty.items(), key=lambda item: (item[0] is None, item[0] or 0)
+                )
+            ],
+        }
@@ -7,8 +7,10 @@ from ..security import get_password_hash
 def get_user_by_email(db: Session, email: str):
     return db.query(User).filter(User.email == email).first()
 
-def create_user(db: Session, user: UserCreate, is_admin: bool = False):
-    hashed_password = get_password_hash(user.password)
+def create_user(db: Session, user: UserCreate, is_admin: bool = False, hashed_password: str = None):
+    # Handlers async devem gerar o hash antes (security.hash_password) e repassá-lo
+    if hashed_password is None:
+        hashed_password = get_password_hash(user.password)
     db_user = User(
         email=user.email,
         name=user.name,
@@ -0,0 +1,108 @@
+"""Schema inicial: tabelas, colunas e configurações de busca full-text
+
+Substitui o create_all + ajustes feitos na inicialização da API. Tudo é
+idempotente: em bancos criados por essas versões anteriores a migração só
+registra a revisão. Os índices da paginação e da busca ficam na 0003
+(CONCURRENTLY, fora de transação).
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+# idioma da API -> configuração nativa do Postgres (mesmo mapa de app/search.py)
+LANGUAGES = {
+    "pt": "portuguese",
+    "en": "english",
+    "es": "spanish",
+}
+
+
+def _has_table(name: str) -> bool:
+    return sa.inspect(op.get_bind()).has_table(name)
+
+
+def _create_search_configs() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS unaccent")
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for lang, pg_config in LANGUAGES.items():
+        op.execute(f"""
+        DO $$
+        BEGIN
+            IF NOT EXISTS (SELECT 1 FROM pg_ts_config WHERE cfgname = 'shapeme_{lang}') THEN
+                CREATE TEXT SEARCH CONFIGURATION shapeme_{lang} (COPY = {pg_config});
+                ALTER TEXT SEARCH CONFIGURATION shapeme_{lang}
+                    ALTER MAPPING FOR hword, hword_part, word WITH unaccent, {pg_config}_stem;
+            END IF;
+        END
+        $$;
+        """)
+
+
+def upgrade() -> None:
+    _create_search_configs()
+
+    if not _has_table("users"):
+        op.create_table(
+            "users",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("email", sa.String()),
+            sa.Column("name", sa.String()),
+            sa.Column("hashed_password", sa.String(), nullable=False),
+            sa.Column("is_admin", sa.Boolean()),
+            sa.Column("is_active", sa.Boolean()),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+            sa.Column("hotmart_transaction_id", sa.String(), nullable=True, unique=True),
+        )
+    op.create_index("ix_users_id", "users", ["id"], if_not_exists=True)
+    op.create_index("ix_users_email", "users", ["email"], unique=True, if_not_exists=True)
+
+    if not _has_table("categories"):
+        op.create_table(
+            "categories",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("name_pt", sa.String(), nullable=False),
+            sa.Column("name_en", sa.String(), nullable=False),
+            sa.Column("name_es", sa.String(), nullable=False),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+            sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        )
+    op.create_index("ix_categories_id", "categories", ["id"], if_not_exists=True)
+
+    if not _has_table("recipes"):
+        op.create_table(
+            "recipes",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("title_pt", sa.String(), nullable=False),
+            sa.Column("title_en", sa.String(), nullable=False),
+            sa.Column("title_es", sa.String(), nullable=False),
+            sa.Column("description_pt", sa.Text(), nullable=False),
+            sa.Column("description_en", sa.Text(), nullable=False),
+            sa.Column("description_es", sa.Text(), nullable=False),
+            sa.Column("image_url", sa.String()),
+            sa.Column("difficulty", sa.Integer()),
+            sa.Column("prep_time_minutes", sa.Integer()),
+            sa.Column("category_id", sa.Integer(), sa.ForeignKey("categories.id")),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+            sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        )
+    op.create_index("ix_recipes_id", "recipes", ["id"], if_not_exists=True)
+
+    # Colunas adicionadas depois da criação das tabelas em bancos antigos
+    op.execute("ALTER TABLE categories ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP WITH TIME ZONE DEFAULT now()")
+    op.execute("ALTER TABLE recipes ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP WITH TIME ZONE DEFAULT now()")
+
+
+def downgrade() -> None:
+    op.drop_table("recipes")
+    op.drop_table("categories")
+    op.drop_table("users")
+    for lang in LANGUAGES:
+        op.execute(f"DROP TEXT SEARCH CONFIGURATION IF EXISTS shapeme_{lang}")
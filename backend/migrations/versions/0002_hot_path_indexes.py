@@ -0,0 +1,40 @@
+"""Índices nos filtros mais usados (recipes.category_id, categories.name_pt)
+
+- recipes.category_id: filtro de categoria das listagens, contagem por
+  categoria e verificação antes de excluir uma categoria.
+- categories.name_pt: verificação de nome duplicado a cada criação.
+
+recipes.created_at já é coberto por ix_recipes_created_at_id (created_at é a
+primeira coluna), que serve tanto a ordenação quanto filtros por data.
+
+Criados com CONCURRENTLY (fora de transação) para não bloquear escritas.
+Se uma criação for interrompida o índice fica INVALID: remova-o e rode
+`alembic upgrade head` de novo.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ("ix_recipes_category_id", "recipes", ["category_id"]),
+    ("ix_categories_name_pt", "categories", ["name_pt"]),
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in INDEXES:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
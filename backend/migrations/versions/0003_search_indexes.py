@@ -0,0 +1,60 @@
+"""Índices da paginação por cursor e da busca (full-text e trigramas)
+
+- ix_recipes_created_at_id: ORDER BY created_at DESC, id DESC do cursor.
+- ix_recipes_search_{pt,en,es}: GIN na mesma expressão de
+  search.search_vector (as queries só usam o índice se a expressão casar).
+- ix_recipes_title_{pt,en,es}_trgm: trigramas dos títulos (sugestões).
+
+Estavam na 0001, criados sem CONCURRENTLY dentro da transação da migração,
+o que bloqueia as escritas em recipes durante todo o build. Em bancos onde a
+0001 antiga já os criou, IF NOT EXISTS torna esta migração um no-op.
+
+Se uma criação for interrompida o índice fica INVALID: remova-o e rode
+`alembic upgrade head` de novo.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+LANGUAGES = ("pt", "en", "es")
+
+
+def _search_expression(lang: str) -> sa.TextClause:
+    return sa.text(
+        f"(setweight(to_tsvector('shapeme_{lang}'::regconfig, title_{lang}), 'A')"
+        f" || setweight(to_tsvector('shapeme_{lang}'::regconfig, description_{lang}), 'B'))"
+    )
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_recipes_created_at_id", "recipes", ["created_at", "id"],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        for lang in LANGUAGES:
+            op.create_index(
+                f"ix_recipes_search_{lang}", "recipes", [_search_expression(lang)],
+                postgresql_using="gin", postgresql_concurrently=True, if_not_exists=True,
+            )
+            op.create_index(
+                f"ix_recipes_title_{lang}_trgm", "recipes", [f"title_{lang}"],
+                postgresql_using="gin", postgresql_ops={f"title_{lang}": "gin_trgm_ops"},
+                postgresql_concurrently=True, if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for lang in LANGUAGES:
+            op.drop_index(f"ix_recipes_title_{lang}_trgm", table_name="recipes", postgresql_concurrently=True, if_exists=True)
+            op.drop_index(f"ix_recipes_search_{lang}", table_name="recipes", postgresql_concurrently=True, if_exists=True)
+        op.drop_index("ix_recipes_created_at_id", table_name="recipes", postgresql_concurrently=True, if_exists=True)
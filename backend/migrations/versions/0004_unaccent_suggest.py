@@ -0,0 +1,53 @@
+"""Sugestões sem acentos: índices GiST de trigramas sobre shapeme_unaccent(title_*)
+
+unaccent() é STABLE (depende do dicionário do search_path) e não pode ser
+usada em índice; shapeme_unaccent fixa o dicionário e é declarada IMMUTABLE.
+Os índices GIN de trigramas da 0003 (títulos com acento) dão lugar a GiST
+sobre a expressão sem acentos, que também atendem ao ORDER BY <<-> ... LIMIT
+das sugestões sem ler todas as linhas que casam.
+
+Criados com CONCURRENTLY (fora de transação). Se uma criação for interrompida
+o índice fica INVALID: remova-o e rode `alembic upgrade head` de novo.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+LANGUAGES = ("pt", "en", "es")
+
+
+def upgrade() -> None:
+    op.execute("""
+    CREATE OR REPLACE FUNCTION shapeme_unaccent(text) RETURNS text
+    LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+    AS $$ SELECT public.unaccent('public.unaccent'::regdictionary, $1) $$
+    """)
+
+    with op.get_context().autocommit_block():
+        for lang in LANGUAGES:
+            op.create_index(
+                f"ix_recipes_title_{lang}_suggest", "recipes", [sa.text(f"shapeme_unaccent(title_{lang}) gist_trgm_ops(siglen=256)")],
+                postgresql_using="gist", postgresql_concurrently=True, if_not_exists=True,
+            )
+            op.drop_index(f"ix_recipes_title_{lang}_trgm", table_name="recipes", postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for lang in LANGUAGES:
+            op.create_index(
+                f"ix_recipes_title_{lang}_trgm", "recipes", [f"title_{lang}"],
+                postgresql_using="gin", postgresql_ops={f"title_{lang}": "gin_trgm_ops"},
+                postgresql_concurrently=True, if_not_exists=True,
+            )
+            op.drop_index(f"ix_recipes_title_{lang}_suggest", table_name="recipes", postgresql_concurrently=True, if_exists=True)
+
+    op.execute("DROP FUNCTION IF EXISTS shapeme_unaccent(text)")
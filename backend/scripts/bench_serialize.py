@@ -0,0 +1,197 @@
+"""
+Micro-benchmark da serialização das listagens de receitas.
+
+Compara, para uma página de receitas:
+
+- antigo: objetos Recipe do ORM -> dicionário por receita -> jsonable_encoder
+  -> json.dumps (caminho de um handler que retorna dict com o JSONResponse
+  padrão do FastAPI)
+- novo: linhas projetadas (projection_columns) -> _serialize_recipes -> dump_json
+  (orjson quando instalado)
+
+e mostra o tamanho da resposta (bytes e gzip) e o tempo de serialização de cada
+projeção: todos os campos, ?lang=pt e ?fields=id,title.
+
+Os dados ficam num SQLite em memória, para medir só a hidratação e a
+serialização (sem rede nem Postgres). Com --base-url, mede também as mesmas
+projeções em GET /api/recipes?limit=N de uma API rodando (requer httpx).
+Rode a partir de backend/:
+
+    python -m scripts.bench_serialize --page 100 --repeat 200 --base-url http://localhost:8000
+"""
+import argparse
+import gzip
+import json
+import os
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+
+# URLs das variantes montadas como em produção (sem chamar a API do Cloudinary)
+os.environ.setdefault("CLOUDINARY_CLOUD_NAME", "demo")
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from sqlalchemy import create_engine, insert, select  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+from sqlalchemy.schema import CreateTable  # noqa: E402
+
+from app.cloudinary_config import CloudinaryService  # noqa: E402
+from app.main import _EMPTY_IMAGE_URLS, _serialize_recipes  # noqa: E402
+from app.models import Category, Recipe  # noqa: E402
+from app.responses import dump_json, orjson  # noqa: E402
+from app.services.recipe_service import projection_columns, resolve_fields  # noqa: E402
+
+# Projeções comparadas: (descrição, ?fields=, ?lang=)
+PROJECTIONS = [
+    ("todos os campos", None, None),
+    ("?lang=pt", None, "pt"),
+    ("?fields=id,title", "id,title", None),
+    ("?lang=pt&fields=id,title,thumbnail_url", "id,title,thumbnail_url", "pt"),
+]
+
+
+def _old_serialize(recipes) -> list:
+    """Serialização anterior: um dicionário por objeto Recipe, com as URLs da imagem."""
+    urls = CloudinaryService.get_image_urls_many(recipe.image_url for recipe in recipes)
+    return [
+        {
+            "id": recipe.id,
+            "title_pt": recipe.title_pt,
+            "title_en": recipe.title_en,
+            "title_es": recipe.title_es,
+            "description_pt": recipe.description_pt,
+            "description_en": recipe.description_en,
+            "description_es": recipe.description_es,
+            "image_url": recipe.image_url,
+            "difficulty": recipe.difficulty,
+            "prep_time_minutes": recipe.prep_time_minutes,
+            "category_id": recipe.category_id,
+            "created_at": recipe.created_at.isoformat() if recipe.created_at else None,
+            **urls.get(recipe.image_url, _EMPTY_IMAGE_URLS),
+        }
+        for recipe in recipes
+    ]
+
+
+def _old_render(recipes, page: int) -> bytes:
+    content = jsonable_encoder({"recipes": _old_serialize(recipes), "total": page, "skip": 0, "limit": page})
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+
+def _new_render(rows, keys, page: int) -> bytes:
+    return dump_json({"recipes": _serialize_recipes(rows, keys), "total": page, "skip": 0, "limit": page})
+
+
+def _seed(engine, page: int) -> None:
+    # Só as tabelas (os índices de busca são expressões do Postgres)
+    with engine.begin() as connection:
+        connection.execute(CreateTable(Category.__table__))
+        connection.execute(CreateTable(Recipe.__table__))
+        connection.execute(insert(Category), [{"id": 1, "name_pt": "Doces", "name_en": "Sweets", "name_es": "Dulces"}])
+        now = datetime.now(timezone.utc)
+        connection.execute(insert(Recipe), [
+            {
+                "id": number,
+                "title_pt": f"Bolo de açaí com granola {number}",
+                "title_en": f"Açaí cake with granola {number}",
+                "title_es": f"Pastel de açaí con granola {number}",
+                "description_pt": "Misture os ingredientes secos, acrescente o açaí e asse por 40 minutos. " * 4,
+                "description_en": "Mix the dry ingredients, add the açaí and bake for 40 minutes. " * 4,
+                "description_es": "Mezcle los ingredientes secos, añada el açaí y hornee 40 minutos. " * 4,
+                "image_url": f"recipes/bolo-de-acai-{number}",
+                "difficulty": number % 5 + 1,
+                "prep_time_minutes": 40,
+                "category_id": 1,
+                "created_at": now - timedelta(minutes=number),
+                "updated_at": now,
+            }
+            for number in range(1, page + 1)
+        ])
+
+
+def _size(body: bytes) -> str:
+    return f"{len(body):>8} bytes  gzip {len(gzip.compress(body, 6)):>7} bytes"
+
+
+def _measure(label: str, run, repeat: int) -> float:
+    run()  # aquece caches (URLs, statement cache)
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run()
+        samples.append(time.perf_counter() - started)
+    median = statistics.median(samples) * 1000
+    print(f"  {label:<38} mediana {median:8.3f} ms   p95 {sorted(samples)[int(repeat * 0.95) - 1] * 1000:8.3f} ms")
+    return median
+
+
+def bench_projections(session: Session, page: int, repeat: int) -> None:
+    """Tamanho e tempo (consulta + serialização) de cada projeção, com o caminho novo."""
+    print("\nprojeções (consulta no SQLite + serialização)")
+    for title, fields, lang in PROJECTIONS:
+        keys = resolve_fields(fields, lang)
+        body = _new_render(session.execute(select(*projection_columns(keys))).all(), keys, page)
+        print(f" {title:<40} {_size(body)}")
+        _measure("tempo", lambda: _new_render(session.execute(select(*projection_columns(keys))).all(), keys, page), repeat)
+
+
+def bench_http(base_url: str, page: int, repeat: int) -> None:
+    """As mesmas projeções em GET /api/recipes de uma API rodando (latência do cliente)."""
+    import httpx
+
+    print(f"\nGET {base_url}/api/recipes?limit={page} (sequencial, sem If-None-Match)")
+    with httpx.Client(base_url=base_url, headers={"Accept-Encoding": "identity"}) as client:
+        for title, fields, lang in PROJECTIONS:
+            params = {"limit": page, **({"fields": fields} if fields else {}), **({"lang": lang} if lang else {})}
+            response = client.get("/api/recipes", params=params)
+            response.raise_for_status()
+            print(f" {title:<40} {_size(response.content)}")
+            _measure("latência", lambda: client.get("/api/recipes", params=params).raise_for_status(), repeat)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--page", type=int, default=100, help="receitas por página (padrão: 100)")
+    parser.add_argument("--repeat", type=int, default=200, help="repetições por cenário (padrão: 200)")
+    parser.add_argument("--base-url", help="mede também GET /api/recipes (ex.: http://localhost:8000)")
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://")
+    _seed(engine, args.page)
+    print(f"{args.page} receitas por página, {args.repeat} repetições, orjson={'sim' if orjson else 'não'}")
+
+    with Session(engine) as session:
+        recipes = session.execute(select(Recipe)).scalars().all()
+
+        bench_projections(session, args.page, args.repeat)
+
+        for title, fields, lang in (PROJECTIONS[0], PROJECTIONS[-1]):
+            keys = resolve_fields(fields, lang)
+            rows = session.execute(select(*projection_columns(keys))).all()
+            assert json.loads(_new_render(rows, keys, args.page))["recipes"][0]["id"] == 1
+            print(f"\n{title}")
+
+            print(" só serialização (dados já carregados)")
+            old = _measure("antigo: ORM + jsonable_encoder", lambda: _old_render(recipes, args.page), args.repeat)
+            new = _measure("novo: linhas + dump_json", lambda: _new_render(rows, keys, args.page), args.repeat)
+            print(f"  {'ganho':<38} {old / new:.1f}x")
+
+            print(" consulta (SQLite em memória) + serialização")
+
+            def old_path():
+                session.expunge_all()
+                _old_render(session.execute(select(Recipe)).scalars().all(), args.page)
+
+            def new_path():
+                _new_render(session.execute(select(*projection_columns(keys))).all(), keys, args.page)
+
+            old = _measure("antigo: ORM + jsonable_encoder", old_path, args.repeat)
+            new = _measure("novo: linhas + dump_json", new_path, args.repeat)
+            print(f"  {'ganho':<38} {old / new:.1f}x")
+
+    if args.base_url:
+        bench_http(args.base_url, args.page, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""
+Latência do typeahead (GET /api/recipes/suggest) num catálogo grande.
+
+1. --seed N completa a tabela recipes até N receitas sintéticas (títulos
+   combinando pratos e ingredientes, com acentos), numa categoria própria.
+   Use só em banco de desenvolvimento.
+2. Mostra o EXPLAIN (ANALYZE, BUFFERS) da query de sugestões (deve usar o
+   índice de trigramas do idioma).
+3. Mede p50/p99 da query direto no banco e, com --base-url, do endpoint HTTP
+   (requisições sequenciais: latência de um usuário digitando).
+
+    python -m scripts.bench_suggest --seed 100000 --base-url http://localhost:8000
+
+Usa a DATABASE_URL da aplicação. O HTTP requer httpx (pip install httpx).
+"""
+import argparse
+import random
+import statistics
+import time
+from typing import List
+
+from sqlalchemy import func, insert, select, text
+
+from app.database import engine
+from app.models import Category, Recipe
+from app.search import suggest_query
+
+SEED_CATEGORY = "Carga de teste"
+SEED_BATCH_SIZE = 5000
+
+DISHES = {
+    "pt": ["Bolo", "Torta", "Salada", "Sopa", "Risoto", "Panqueca", "Moqueca", "Escondidinho", "Creme", "Pão",
+           "Mousse", "Omelete", "Farofa", "Brigadeiro", "Suflê", "Caldo", "Purê", "Quiche", "Wrap", "Smoothie"],
+    "en": ["Cake", "Pie", "Salad", "Soup", "Risotto", "Pancake", "Stew", "Casserole", "Cream", "Bread",
+           "Mousse", "Omelette", "Crumble", "Fudge", "Soufflé", "Broth", "Mash", "Quiche", "Wrap", "Smoothie"],
+    "es": ["Pastel", "Tarta", "Ensalada", "Sopa", "Risotto", "Panqueque", "Guiso", "Cazuela", "Crema", "Pan",
+           "Mousse", "Tortilla", "Migas", "Trufa", "Suflé", "Caldo", "Puré", "Quiche", "Wrap", "Batido"],
+}
+INGREDIENTS = {
+    "pt": ["açaí", "cenoura", "maçã", "limão", "abóbora", "frango", "feijão", "mandioca", "coco", "banana",
+           "espinafre", "grão-de-bico", "pêssego", "maracujá", "café", "aveia", "tâmara", "brócolis", "salmão", "cogumelos"],
+    "en": ["açaí", "carrot", "apple", "lemon", "pumpkin", "chicken", "beans", "cassava", "coconut", "banana",
+           "spinach", "chickpeas", "peach", "passion fruit", "coffee", "oats", "dates", "broccoli", "salmon", "mushrooms"],
+    "es": ["açaí", "zanahoria", "manzana", "limón", "calabaza", "pollo", "frijoles", "yuca", "coco", "plátano",
+           "espinaca", "garbanzos", "melocotón", "maracuyá", "café", "avena", "dátiles", "brócoli", "salmón", "champiñones"],
+}
+LINKS = {"pt": ("de", "e"), "en": ("with", "and"), "es": ("de", "y")}
+STYLES = {
+    "pt": ["", "fit", "low carb", "sem glúten", "vegano", "proteico", "caseiro", "rápido"],
+    "en": ["", "fit", "low carb", "gluten-free", "vegan", "high-protein", "homemade", "quick"],
+    "es": ["", "fit", "bajo en carbohidratos", "sin gluten", "vegano", "proteico", "casero", "rápido"],
+}
+
+# Termos como digitados: prefixos, sem acento e com erros de digitação
+TERMS = ["bolo cenora", "acai", "panquec", "moqueca de fango", "brigadeir", "abobora", "sufle", "maracuja",
+         "pao de banana", "salada grao", "risoto cogumel", "escondidinho mandioc", "limao", "torta de maca"]
+
+
+def _title(lang: str, dish: int, ingredients: List[int], style: int) -> str:
+    """Ex.: "Bolo de cenoura e aveia fit" (mesma combinação nos três idiomas)."""
+    of, and_ = LINKS[lang]
+    words = [DISHES[lang][dish], of, f" {and_} ".join(INGREDIENTS[lang][index] for index in ingredients)]
+    if STYLES[lang][style]:
+        words.append(STYLES[lang][style])
+    return " ".join(words)
+
+
+def seed(total: int) -> None:
+    rng = random.Random(42)
+    with engine.begin() as connection:
+        existing = connection.scalar(select(func.count()).select_from(Recipe))
+        if existing >= total:
+            print(f"recipes já tem {existing} receitas (>= {total}), nada a inserir")
+            return
+
+        category_id = connection.scalar(select(Category.id).where(Category.name_pt == SEED_CATEGORY))
+        if category_id is None:
+            category_id = connection.scalar(
+                insert(Category).values(name_pt=SEED_CATEGORY, name_en="Load test", name_es="Prueba de carga")
+                .returning(Category.id)
+            )
+
+        missing = total - existing
+        print(f"inserindo {missing} receitas (já existem {existing})")
+        for start in range(0, missing, SEED_BATCH_SIZE):
+            batch = []
+            for _ in range(min(SEED_BATCH_SIZE, missing - start)):
+                dish, style = rng.randrange(len(DISHES["pt"])), rng.randrange(len(STYLES["pt"]))
+                ingredients = rng.sample(range(len(INGREDIENTS["pt"])), rng.choice((1, 2, 2, 3)))
+                titles = {lang: _title(lang, dish, ingredients, style) for lang in DISHES}
+                batch.append({
+                    **{f"title_{lang}": title for lang, title in titles.items()},
+                    **{f"description_{lang}": f"{title}: modo de preparo." for lang, title in titles.items()},
+                    "image_url": "",
+                    "difficulty": rng.randint(1, 5),
+                    "prep_time_minutes": rng.choice((10, 20, 30, 45, 60)),
+                    "category_id": category_id,
+                })
+            connection.execute(insert(Recipe), batch)
+        connection.execute(text("ANALYZE recipes"))
+
+
+def _summary(samples: List[float]) -> str:
+    ms = sorted(sample * 1000 for sample in samples)
+    p99 = ms[min(len(ms) - 1, int(len(ms) * 0.99))]
+    return f"p50 {statistics.median(ms):6.2f} ms  p99 {p99:6.2f} ms  max {ms[-1]:6.2f} ms  ({len(ms)} amostras)"
+
+
+def explain(term: str, lang: str) -> None:
+    with engine.connect() as connection:
+        compiled = suggest_query(term, lang).compile(dialect=connection.dialect)
+        plan = connection.exec_driver_sql("EXPLAIN (ANALYZE, BUFFERS) " + str(compiled), compiled.params)
+        print(f"\nEXPLAIN ({lang}, {term!r})")
+        for (line,) in plan:
+            print("  " + line)
+
+
+def bench_queries(lang: str, rounds: int) -> None:
+    samples = []
+    with engine.connect() as connection:
+        for term in TERMS:
+            connection.execute(suggest_query(term, lang)).all()  # aquece
+        for _ in range(rounds):
+            for term in TERMS:
+                started = time.perf_counter()
+                connection.execute(suggest_query(term, lang)).all()
+                samples.append(time.perf_counter() - started)
+    print(f"\nquery no banco ({lang})      {_summary(samples)}")
+
+
+def bench_http(base_url: str, lang: str, rounds: int) -> None:
+    import httpx
+
+    samples = []
+    with httpx.Client(base_url=base_url) as client:
+        for term in TERMS:
+            client.get("/api/recipes/suggest", params={"q": term, "lang": lang}).raise_for_status()
+        for _ in range(rounds):
+            for term in TERMS:
+                started = time.perf_counter()
+                client.get("/api/recipes/suggest", params={"q": term, "lang": lang}).raise_for_status()
+                samples.append(time.perf_counter() - started)
+    print(f"GET /api/recipes/suggest ({lang}) {_summary(samples)}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seed", type=int, default=0, help="completa recipes até N receitas (0: não insere)")
+    parser.add_argument("--base-url", help="mede também o endpoint HTTP (ex.: http://localhost:8000)")
+    parser.add_argument("--lang", default="pt", choices=sorted(DISHES))
+    parser.add_argument("--rounds", type=int, default=50, help=f"repetições dos {len(TERMS)} termos")
+    args = parser.parse_args()
+
+    if args.seed:
+        seed(args.seed)
+    with engine.connect() as connection:
+        print(f"{connection.scalar(select(func.count()).select_from(Recipe))} receitas")
+
+    explain(TERMS[0], args.lang)
+    bench_queries(args.lang, args.rounds)
+    if args.base_url:
+        bench_http(args.base_url, args.lang, args.rounds)
+
+    # Mostra o que os termos sem acento encontram
+    with engine.connect() as connection:
+        print()
+        for term in ("acai", "abobora", "maracuja"):
+            titles = [row.title for row in connection.execute(suggest_query(term, args.lang, 3))]
+            print(f"  {term!r:<12} -> {titles}")
+
+
+if __name__ == "__main__":
+    main()
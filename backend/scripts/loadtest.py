@@ -0,0 +1,140 @@
+"""
+Teste de carga da API (asyncio + httpx).
+
+N clientes concorrentes repetem as rotas de --path durante --duration segundos
+enquanto uma sonda faz GET em --probe-path (rota sem banco, ex. /) a cada
+--probe-interval. A latência da sonda mostra se o event loop fica livre
+durante as queries: com handlers bloqueantes ela sobe junto com a carga.
+
+    pip install httpx
+    python -m scripts.loadtest --base-url http://localhost:8000 --concurrency 50
+
+Rotas autenticadas: --header "Authorization: Bearer <token>".
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from collections import Counter
+from typing import Dict, List
+
+import httpx
+
+DEFAULT_PATHS = ["/api/recipes?limit=20", "/api/categories"]
+
+
+def _percentile(samples: List[float], percent: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * percent / 100))]
+
+
+def _summary(samples: List[float]) -> str:
+    if not samples:
+        return "sem amostras"
+    ms = [sample * 1000 for sample in samples]
+    return (
+        f"p50 {statistics.median(ms):7.1f} ms  p95 {_percentile(ms, 95):7.1f} ms  "
+        f"p99 {_percentile(ms, 99):7.1f} ms  max {max(ms):7.1f} ms"
+    )
+
+
+class LoadTest:
+    def __init__(self, args: argparse.Namespace):
+        self.args = args
+        self.latencies: List[float] = []
+        self.probe_latencies: List[float] = []
+        self.statuses: Counter = Counter()
+        self.errors: Counter = Counter()
+        self.recording = False
+        self.stop_at = 0.0
+
+    async def _request(self, client: httpx.AsyncClient, path: str) -> None:
+        started = time.perf_counter()
+        try:
+            response = await client.get(path)
+            await response.aread()
+        except httpx.HTTPError as e:
+            if self.recording:
+                self.errors[type(e).__name__] += 1
+            return
+        if self.recording:
+            self.latencies.append(time.perf_counter() - started)
+            self.statuses[response.status_code] += 1
+
+    async def _client(self, client: httpx.AsyncClient, offset: int) -> None:
+        paths = self.args.path or DEFAULT_PATHS
+        number = offset
+        while time.monotonic() < self.stop_at:
+            await self._request(client, paths[number % len(paths)])
+            number += 1
+
+    async def _probe(self, client: httpx.AsyncClient) -> None:
+        while time.monotonic() < self.stop_at:
+            started = time.perf_counter()
+            try:
+                response = await client.get(self.args.probe_path)
+                await response.aread()
+                if self.recording:
+                    self.probe_latencies.append(time.perf_counter() - started)
+            except httpx.HTTPError as e:
+                if self.recording:
+                    self.errors[f"sonda: {type(e).__name__}"] += 1
+            await asyncio.sleep(self.args.probe_interval)
+
+    async def run(self) -> Dict:
+        args = self.args
+        headers = dict(header.split(":", 1) for header in args.header)
+        headers = {name.strip(): value.strip() for name, value in headers.items()}
+        limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+        async with httpx.AsyncClient(base_url=args.base_url, headers=headers, limits=limits, timeout=args.timeout) as client, \
+                httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout) as probe_client:
+            self.stop_at = time.monotonic() + args.warmup + args.duration
+            tasks = [asyncio.create_task(self._client(client, offset)) for offset in range(args.concurrency)]
+            tasks.append(asyncio.create_task(self._probe(probe_client)))
+
+            # Aquecimento fora das estatísticas (conexões do pool, caches)
+            await asyncio.sleep(args.warmup)
+            self.recording = True
+            started = time.perf_counter()
+            await asyncio.gather(*tasks)
+            elapsed = time.perf_counter() - started
+
+        return {
+            "requests": len(self.latencies),
+            "elapsed": elapsed,
+            "rps": len(self.latencies) / elapsed if elapsed else 0.0,
+        }
+
+    def report(self, result: Dict) -> None:
+        args = self.args
+        print(f"{args.base_url}  concorrência {args.concurrency}  duração {result['elapsed']:.1f}s")
+        print(f"  rotas: {', '.join(args.path or DEFAULT_PATHS)}")
+        print(f"  requisições: {result['requests']}  ({result['rps']:.1f} req/s)")
+        print(f"  status: {dict(sorted(self.statuses.items()))}")
+        if self.errors:
+            print(f"  erros: {dict(self.errors)}")
+        print(f"  latência   {_summary(self.latencies)}")
+        print(f"  sonda {args.probe_path:<4} {_summary(self.probe_latencies)}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--path", action="append", help=f"rota a carregar (repetível; padrão: {' '.join(DEFAULT_PATHS)})")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=20.0, help="segundos medidos")
+    parser.add_argument("--warmup", type=float, default=3.0, help="segundos descartados no início")
+    parser.add_argument("--probe-path", default="/")
+    parser.add_argument("--probe-interval", type=float, default=0.05)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--header", action="append", default=[], help='ex.: "Authorization: Bearer <token>"')
+    args = parser.parse_args()
+
+    test = LoadTest(args)
+    test.report(asyncio.run(test.run()))
+
+
+if __name__ == "__main__":
+    main()